@@ -123,13 +123,15 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
 
     "axes.middleware.AxesMiddleware",
-    "audit.middleware.CaptureIPMiddleware",
+    "audit.middleware.AuditBufferMiddleware",
     "accounts.middleware.LoginRequiredMiddleware",
 ]
 
 # Authentication backends (axes must be first)
 AUTHENTICATION_BACKENDS = [
     "axes.backends.AxesStandaloneBackend",
+    "accounts.backends.RequestUserBackend",
+    # Still resolves sessions that were logged in before RequestUserBackend
     "django.contrib.auth.backends.ModelBackend",
 ]
 
@@ -242,6 +244,9 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# Files served by WhiteNoise at the site root (browsers probe /favicon.ico directly)
+WHITENOISE_ROOT = BASE_DIR / "public"
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
 
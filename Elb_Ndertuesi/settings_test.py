@@ -8,6 +8,10 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
+        # Durability is irrelevant for a throwaway in-memory DB
+        "OPTIONS": {
+            "init_command": "PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY; PRAGMA temp_store=MEMORY;",
+        },
     }
 }
 
@@ -21,3 +25,23 @@ AXES_ENABLED = False
 
 # Faster email backend for testing
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+
+class DisableMigrations:
+    """Build test tables straight from the current models instead of replaying migrations."""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()
+
+# No per-query history accumulation during large test setUps
+DEBUG = False
+DEBUG_PROPAGATE_EXCEPTIONS = True
+
+# Covering-index INCLUDE columns are PostgreSQL-only; SQLite just ignores them
+SILENCED_SYSTEM_CHECKS = ["models.W040"]
@@ -16,7 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path ,include
-from django.shortcuts import redirect
+from django.views.generic import RedirectView
 
 handler403 = "core.views.permission_denied_view"
 handler404 = "core.views.page_not_found_view"
@@ -24,12 +24,8 @@ handler500 = "core.views.server_error_view"
 
 
 
-def root_redirect(request):
-    return redirect("core:home")
-
-
 urlpatterns = [
-    path("", root_redirect, name="root"),
+    path("", RedirectView.as_view(pattern_name="core:home", permanent=True), name="root"),
     path('admin/', admin.site.urls),
     
     path("accounts/", include(("accounts.urls", "accounts"), namespace="accounts")),
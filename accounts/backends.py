@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class RequestUserBackend(ModelBackend):
+    """
+    ModelBackend that loads the session user together with the linked
+    Employee, which nearly every request reads afterwards (employee_flags
+    context processor, budget/ownership checks).
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = (
+                UserModel._default_manager
+                .select_related("employee")
+                .get(pk=user_id)
+            )
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -3,6 +3,31 @@ from django.core.exceptions import PermissionDenied
 from functools import wraps
 from django.contrib.auth.views import redirect_to_login
 
+
+def cache_for_request(fn):
+    """
+    Memoize a permission check per request (in request._perm_cache),
+    keyed on the function name and extra positional args.
+    """
+    @wraps(fn)
+    def _wrapped(request, *args):
+        cache = getattr(request, "_perm_cache", None)
+        if cache is None:
+            cache = request._perm_cache = {}
+        key = (fn.__name__, *args)
+        if key not in cache:
+            cache[key] = fn(request, *args)
+        return cache[key]
+    return _wrapped
+
+
+@cache_for_request
+def _is_staffish(request):
+    """Authenticated staff or superuser; chained decorators check once per request."""
+    user = request.user
+    return bool(user.is_authenticated and (user.is_staff or user.is_superuser))
+
+
 def staff_required(view_func=None, *, raise_exception=False):
     """
     Allow only staff or superuser.
@@ -10,23 +35,23 @@ def staff_required(view_func=None, *, raise_exception=False):
     - raise_exception=True  -> returns 403 (PermissionDenied) if logged in but not allowed
     """
 
-    def check(user):
-        return user.is_authenticated and (user.is_staff or user.is_superuser)
-
-    decorator = user_passes_test(check)
-
     if raise_exception:
         # if user is logged in but not allowed -> 403 instead of redirect loop
         def _wrapped(view):
+            @wraps(view)
             def inner(request, *args, **kwargs):
+                if _is_staffish(request):
+                    return view(request, *args, **kwargs)
                 if not request.user.is_authenticated:
-                    return decorator(view)(request, *args, **kwargs)
-                if not check(request.user):
-                    raise PermissionDenied
-                return view(request, *args, **kwargs)
+                    return redirect_to_login(request.get_full_path())
+                raise PermissionDenied
             return inner
         return _wrapped(view_func) if view_func else _wrapped
 
+    def check(user):
+        return user.is_authenticated and (user.is_staff or user.is_superuser)
+
+    decorator = user_passes_test(check)
     return decorator(view_func) if view_func else decorator
 
 
@@ -35,23 +60,24 @@ def staff_required(view_func=None, *, raise_exception=False):
 def staff_or_own_employee_detail(view_func):
     @wraps(view_func)
     def _wrapped(request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return redirect_to_login(request.get_full_path())
-
         # staff/superuser can see any employee
-        if request.user.is_staff or request.user.is_superuser:
+        if _is_staffish(request):
             return view_func(request, *args, **kwargs)
 
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+
         employee_id = kwargs.get("employee_id")
         if employee_id is None:
             raise PermissionDenied("Missing employee_id")
 
-        # regular user must be linked to an Employee
-        if not hasattr(request.user, "employee") or request.user.employee is None:
+        # regular user must be linked to an Employee (single reverse OneToOne lookup)
+        employee = getattr(request.user, "employee", None)
+        if employee is None:
             raise PermissionDenied("User is not linked to an Employee.")
 
-        # allow only if it's their own employee page
-        if int(employee_id) != int(request.user.employee.id):
+        # allow only if it's their own employee page (<int:employee_id> is already an int)
+        if employee_id != employee.pk:
             raise PermissionDenied("You can only view your own page.")
 
         return view_func(request, *args, **kwargs)
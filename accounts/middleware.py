@@ -1,32 +1,31 @@
 from django.conf import settings
 from django.http import HttpResponsePermanentRedirect
 from django.shortcuts import redirect
-from django.urls import reverse
+
+# Keep in sync with accounts/urls.py (mounted under "accounts/" in Elb_Ndertuesi/urls.py)
+LOGIN_PATH = "/accounts/login/"
+LOGOUT_PATH = "/accounts/logout/"
 
 
 class LoginRequiredMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
-        self.login_path = reverse("accounts:login")
-        self.logout_path = reverse("accounts:logout")
+        self.login_path = LOGIN_PATH
+        self.logout_path = LOGOUT_PATH
+
+        # Paths that never require login
+        self._exempt_prefixes = ("/admin/", settings.STATIC_URL, "/media/")
+        self._exempt_exact = frozenset({"/favicon.ico", self.login_path, self.logout_path})
 
     def __call__(self, request):
         path = request.path
 
-        # Allow admin + static/media
-        if path.startswith("/admin/") or path.startswith("/static/") or path.startswith("/media/"):
-            return self.get_response(request)
-
-        # Allow favicon
-        if path == "/favicon.ico":
-            return self.get_response(request)
-
-        # Allow auth endpoints
-        if path in (self.login_path, self.logout_path):
+        # Allow admin + static/media, favicon and auth endpoints
+        if path.startswith(self._exempt_prefixes) or path in self._exempt_exact:
             return self.get_response(request)
 
         # If not logged in -> send to login
         if not request.user.is_authenticated:
-            return redirect("accounts:login")
+            return redirect(self.login_path)
 
         return self.get_response(request)
@@ -3,29 +3,26 @@ from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.db.models.signals import post_migrate
 from django.contrib.auth.models import Group
 
-from audit.utils import log_action
-
-
-def get_client_ip(request):
-    xff = request.META.get("HTTP_X_FORWARDED_FOR")
-    if xff:
-        return xff.split(",")[0].strip()
-    return request.META.get("REMOTE_ADDR")
+from audit.models import AuditLog
+from audit.utils import get_client_ip, log_action
 
 
 @receiver(post_migrate)
 def ensure_default_groups(sender, **kwargs):
     if sender.name != "accounts":
         return
-    Group.objects.get_or_create(name="employee")
-    Group.objects.get_or_create(name="staff")
+    # Single INSERT ... ON CONFLICT DO NOTHING instead of two get_or_create round-trips
+    Group.objects.bulk_create(
+        [Group(name=name) for name in ("employee", "staff")],
+        ignore_conflicts=True,
+    )
 
 
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
     log_action(
         user=user,
-        action="LOGIN",
+        action=AuditLog.Action.LOGIN,
         model="User",
         ip_address=get_client_ip(request),
     )
@@ -37,7 +34,7 @@ def log_user_logout(sender, request, user, **kwargs):
         return
     log_action(
         user=user,
-        action="LOGOUT",
+        action=AuditLog.Action.LOGOUT,
         model="User",
         ip_address=get_client_ip(request),
     )
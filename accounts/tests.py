@@ -166,3 +166,64 @@ class LoginRequiredMiddlewareTest(TestCase):
         """Test login page doesn't require authentication."""
         response = self.client.get(reverse("accounts:login"))
         self.assertEqual(response.status_code, 200)
+
+    def test_hardcoded_auth_paths_match_urlconf(self):
+        """Test the middleware's hard-coded paths match accounts/urls.py."""
+        from accounts.middleware import LOGIN_PATH, LOGOUT_PATH
+        self.assertEqual(LOGIN_PATH, reverse("accounts:login"))
+        self.assertEqual(LOGOUT_PATH, reverse("accounts:logout"))
+
+    def test_asset_suffix_outside_static_requires_login(self):
+        """Test asset-like paths outside STATIC_URL still redirect to login."""
+        response = self.client.get("/home/missing.css")
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("login", response.url)
+
+
+class CacheForRequestTest(TestCase):
+    """Tests for the cache_for_request helper."""
+
+    def test_check_runs_once_per_request_and_args(self):
+        """Test repeated checks on one request reuse the first result."""
+        from django.test import RequestFactory
+        from accounts.decorators import cache_for_request
+
+        calls = []
+
+        @cache_for_request
+        def check(request, name):
+            calls.append(name)
+            return name == "staff"
+
+        request = RequestFactory().get("/")
+        self.assertTrue(check(request, "staff"))
+        self.assertTrue(check(request, "staff"))
+        self.assertFalse(check(request, "employee"))
+        self.assertEqual(calls, ["staff", "employee"])
+
+        # A new request starts with an empty cache
+        check(RequestFactory().get("/"), "staff")
+        self.assertEqual(calls, ["staff", "employee", "staff"])
+
+
+class RequestUserBackendTest(TestCase):
+    """Tests for the session user loader."""
+
+    def test_get_user_preloads_employee(self):
+        """Test the employee lookup after get_user issues no query."""
+        from accounts.backends import RequestUserBackend
+
+        user = User.objects.create_user(username="worker", password="testpass123")
+        Employee.objects.create(user=user, name="Worker", position="Driver")
+
+        with self.assertNumQueries(1):
+            loaded = RequestUserBackend().get_user(user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(loaded.employee.name, "Worker")
+
+    def test_model_backend_sessions_still_resolve(self):
+        """Test a session logged in via ModelBackend stays logged in."""
+        user = User.objects.create_user(username="worker", password="testpass123")
+        self.client.force_login(user, backend="django.contrib.auth.backends.ModelBackend")
+        response = self.client.get(reverse("core:home"))
+        self.assertEqual(response.status_code, 200)
@@ -1,8 +1,9 @@
 from django.contrib.auth.views import LoginView, LogoutView
-from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
 
+from .middleware import LOGIN_PATH
+
 
 @method_decorator(never_cache, name="dispatch")
 class SecureLoginView(LoginView):
@@ -11,4 +12,4 @@ class SecureLoginView(LoginView):
 
 
 class SecureLogoutView(LogoutView):
-    next_page = reverse_lazy("accounts:login")
+    next_page = LOGIN_PATH
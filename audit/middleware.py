@@ -1,15 +1,20 @@
-def get_client_ip(request):
-    """Extract real client IP, checking X-Forwarded-For for proxied requests."""
-    xff = request.META.get("HTTP_X_FORWARDED_FOR")
-    if xff:
-        return xff.split(",")[0].strip()
-    return request.META.get("REMOTE_ADDR")
+from .utils import flush_pending, start_buffering
 
 
-class CaptureIPMiddleware:
+class AuditBufferMiddleware:
+    """
+    Collect the request's audit rows and insert them in one query once the
+    view returns, while its database connection is still open.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        request.client_ip = get_client_ip(request)
-        return self.get_response(request)
+        start_buffering()
+        try:
+            return self.get_response(request)
+        finally:
+            # Always empties the buffer, even if the view raised; insert
+            # failures are logged there, so the response is returned unchanged
+            flush_pending()
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_alter_auditlog_object_id'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='auditlog',
+            options={'ordering': ['-timestamp']},
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('DELETE', 'Delete'), ('ADD', 'Add Quantity'), ('ADJUST', 'Budget Adjustment'), ('WITHDRAW', 'Withdraw'), ('RETURN', 'Return'), ('EXPORT', 'Export'), ('LOGIN', 'Login'), ('LOGOUT', 'Logout')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp'], name='audit_ts_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['model', 'action', '-timestamp'], name='audit_model_action_ts'),
+        ),
+    ]
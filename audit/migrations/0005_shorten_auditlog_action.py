@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:52
+
+from django.db import migrations, models
+
+
+ACTION_CODES = {
+    "CREATE": "C",
+    "UPDATE": "U",
+    "DELETE": "D",
+    "ADD": "A",
+    "ADJUST": "J",
+    "WITHDRAW": "W",
+    "RETURN": "R",
+    "EXPORT": "X",
+    "LOGIN": "I",
+    "LOGOUT": "O",
+}
+
+
+def forwards(apps, schema_editor):
+    AuditLog = apps.get_model("audit", "AuditLog")
+    for old, new in ACTION_CODES.items():
+        AuditLog.objects.filter(action=old).update(action=new)
+
+
+def backwards(apps, schema_editor):
+    AuditLog = apps.get_model("audit", "AuditLog")
+    for old, new in ACTION_CODES.items():
+        AuditLog.objects.filter(action=new).update(action=old)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0004_auditlog_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('C', 'Create'), ('U', 'Update'), ('D', 'Delete'), ('A', 'Add Quantity'), ('J', 'Budget Adjustment'), ('W', 'Withdraw'), ('R', 'Return'), ('X', 'Export'), ('I', 'Login'), ('O', 'Logout')], max_length=2),
+        ),
+    ]
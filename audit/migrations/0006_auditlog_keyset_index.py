@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0005_shorten_auditlog_action'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='auditlog',
+            options={'ordering': ['-timestamp', '-id']},
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_ts_desc',
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp', '-id'], name='audit_ts_id_desc'),
+        ),
+    ]
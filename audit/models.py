@@ -4,18 +4,18 @@ from django.conf import settings
 User = settings.AUTH_USER_MODEL
 
 class AuditLog(models.Model):
-    ACTION_CHOICES = [
-        ("CREATE", "Create"),
-        ("UPDATE", "Update"),
-        ("DELETE", "Delete"),
-        ("ADD", "Add Quantity"),
-        ("ADJUST", "Budget Adjustment"),
-        ("WITHDRAW", "Withdraw"),
-        ("RETURN", "Return"),
-        ("EXPORT", "Export"),
-        ("LOGIN", "Login"),
-        ("LOGOUT", "Logout"),
-    ]
+    # Stored as single-character codes to keep the append-only table narrow
+    class Action(models.TextChoices):
+        CREATE = "C", "Create"
+        UPDATE = "U", "Update"
+        DELETE = "D", "Delete"
+        ADD = "A", "Add Quantity"
+        ADJUST = "J", "Budget Adjustment"
+        WITHDRAW = "W", "Withdraw"
+        RETURN = "R", "Return"
+        EXPORT = "X", "Export"
+        LOGIN = "I", "Login"
+        LOGOUT = "O", "Logout"
 
     user = models.ForeignKey(
         User,
@@ -23,7 +23,7 @@ class AuditLog(models.Model):
         null=True,
         blank=True
     )
-    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    action = models.CharField(max_length=2, choices=Action.choices)
     model = models.CharField(max_length=100)
     object_id = models.CharField(max_length=50, blank=True, null=True)
     description = models.TextField(blank=True)
@@ -31,5 +31,13 @@ class AuditLog(models.Model):
 
     ip_address = models.GenericIPAddressField(null=True, blank=True)
 
+    class Meta:
+        ordering = ["-timestamp", "-id"]
+        # Match the dashboard: ORDER BY timestamp DESC, optionally filtered by model/action
+        indexes = [
+            models.Index(fields=["-timestamp", "-id"], name="audit_ts_id_desc"),
+            models.Index(fields=["model", "action", "-timestamp"], name="audit_model_action_ts"),
+        ]
+
     def __str__(self):
-        return f"{self.timestamp} - {self.user} - {self.action}"
+        return f"{self.timestamp} - {self.user} - {self.get_action_display()}"
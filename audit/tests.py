@@ -1,11 +1,16 @@
 """
 Tests for the Audit app - Action logging and compliance.
 """
-from django.test import TestCase, Client
+from unittest import mock
+
+from django.db import DatabaseError, IntegrityError, transaction
+from django.http import HttpResponse
+from django.test import TestCase, TransactionTestCase, Client, RequestFactory
 from django.contrib.auth.models import User, Group
 from django.urls import reverse
 from audit.models import AuditLog
-from audit.utils import log_action
+from audit.middleware import AuditBufferMiddleware
+from audit.utils import get_client_ip, log_action
 
 
 class AuditLogModelTest(TestCase):
@@ -21,34 +26,30 @@ class AuditLogModelTest(TestCase):
         """Test creating an audit log entry."""
         log = AuditLog.objects.create(
             user=self.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="Product",
             object_id=1,
             description="Created product: Test Product",
             ip_address="127.0.0.1"
         )
-        self.assertEqual(log.action, "CREATE")
+        self.assertEqual(log.action, AuditLog.Action.CREATE)
         self.assertEqual(log.model, "Product")
 
     def test_audit_log_str(self):
         """Test audit log string representation."""
         log = AuditLog.objects.create(
             user=self.user,
-            action="UPDATE",
+            action=AuditLog.Action.UPDATE,
             model="Employee",
             object_id=1,
             description="Updated employee"
         )
         result = str(log)
-        self.assertIn("UPDATE", result)
+        self.assertIn("Update", result)
 
     def test_audit_log_actions(self):
         """Test various audit log actions."""
-        actions = [
-            "CREATE", "UPDATE", "DELETE", "ADD",
-            "WITHDRAW", "RETURN", "EXPORT", "LOGIN", "LOGOUT"
-        ]
-        for action in actions:
+        for action in AuditLog.Action:
             log = AuditLog.objects.create(
                 user=self.user,
                 action=action,
@@ -61,7 +62,7 @@ class AuditLogModelTest(TestCase):
         """Test that timestamp is automatically set."""
         log = AuditLog.objects.create(
             user=self.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="Test",
             description="Test"
         )
@@ -71,7 +72,7 @@ class AuditLogModelTest(TestCase):
         """Test audit log can be created without user (system actions)."""
         log = AuditLog.objects.create(
             user=None,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="System",
             description="System action"
         )
@@ -93,7 +94,7 @@ class LogActionUtilityTest(TestCase):
 
         log_action(
             user=self.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="Product",
             object_id=1,
             description="Created product",
@@ -106,7 +107,7 @@ class LogActionUtilityTest(TestCase):
         """Test that log_action stores correct data."""
         log_action(
             user=self.user,
-            action="UPDATE",
+            action=AuditLog.Action.UPDATE,
             model="Employee",
             object_id=42,
             description="Updated employee details",
@@ -115,7 +116,7 @@ class LogActionUtilityTest(TestCase):
 
         log = AuditLog.objects.latest("timestamp")
         self.assertEqual(log.user, self.user)
-        self.assertEqual(log.action, "UPDATE")
+        self.assertEqual(log.action, AuditLog.Action.UPDATE)
         self.assertEqual(log.model, "Employee")
         self.assertEqual(str(log.object_id), "42")
         self.assertEqual(log.ip_address, "10.0.0.1")
@@ -124,7 +125,7 @@ class LogActionUtilityTest(TestCase):
         """Test log_action without object_id."""
         log_action(
             user=self.user,
-            action="EXPORT",
+            action=AuditLog.Action.EXPORT,
             model="Report",
             description="Exported report"
         )
@@ -133,6 +134,83 @@ class LogActionUtilityTest(TestCase):
         self.assertIsNone(log.object_id)
 
 
+class GetClientIpTest(TestCase):
+    """Tests for the get_client_ip helper."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_uses_first_forwarded_address(self):
+        """Test the first X-Forwarded-For hop is the client IP."""
+        request = self.factory.get(
+            "/", HTTP_X_FORWARDED_FOR=" 203.0.113.5 , 10.0.0.1, 10.0.0.2"
+        )
+        self.assertEqual(get_client_ip(request), "203.0.113.5")
+
+    def test_falls_back_to_remote_addr(self):
+        """Test REMOTE_ADDR is used without X-Forwarded-For."""
+        request = self.factory.get("/", REMOTE_ADDR="192.168.1.7")
+        self.assertEqual(get_client_ip(request), "192.168.1.7")
+
+
+class LogActionBufferingTest(TransactionTestCase):
+    """Tests for per-request buffering of audit log rows."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpass123"
+        )
+
+    def _run(self, view):
+        return AuditBufferMiddleware(view)(RequestFactory().get("/"))
+
+    def test_rows_written_when_request_finishes(self):
+        """Test that rows logged during a request are inserted at request end."""
+        def view(request):
+            log_action(user=self.user, action=AuditLog.Action.CREATE, model="Product")
+            log_action(user=self.user, action=AuditLog.Action.UPDATE, model="Product")
+            self.assertEqual(AuditLog.objects.count(), 0)
+            return HttpResponse()
+
+        self._run(view)
+        self.assertEqual(AuditLog.objects.count(), 2)
+
+    def test_rows_logged_in_transaction_wait_for_commit(self):
+        """Test that rows logged inside a transaction are kept only if it commits."""
+        def view(request):
+            with transaction.atomic():
+                log_action(user=self.user, action=AuditLog.Action.CREATE, model="Product")
+            try:
+                with transaction.atomic():
+                    log_action(user=self.user, action=AuditLog.Action.DELETE, model="Product")
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+            self.assertEqual(AuditLog.objects.count(), 0)
+            return HttpResponse()
+
+        self._run(view)
+        self.assertEqual(list(AuditLog.objects.values_list("action", flat=True)), [AuditLog.Action.CREATE])
+
+    def test_failed_flush_is_logged_and_empties_buffer(self):
+        """Test a failing insert keeps the response, logs the lost rows and clears the buffer."""
+        def view(request):
+            log_action(user=self.user, action=AuditLog.Action.CREATE, model="Product", object_id=7)
+            return HttpResponse(status=302)
+
+        with mock.patch.object(AuditLog.objects, "bulk_create", side_effect=DatabaseError):
+            with self.assertLogs("audit.utils", level="ERROR") as logs:
+                response = self._run(view)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("Failed to write 1 audit log rows", logs.output[0])
+        self.assertIn("Product/C/7", logs.output[0])
+
+        log_action(user=self.user, action=AuditLog.Action.UPDATE, model="Product")
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+
 class AuditDashboardViewTest(TestCase):
     """Tests for the audit dashboard view."""
 
@@ -163,7 +241,7 @@ class AuditDashboardViewTest(TestCase):
         for i in range(5):
             AuditLog.objects.create(
                 user=self.superuser,
-                action="CREATE",
+                action=AuditLog.Action.CREATE,
                 model="Product",
                 object_id=i,
                 description=f"Created product {i}"
@@ -193,14 +271,14 @@ class AuditDashboardViewTest(TestCase):
         # Create a different action log
         AuditLog.objects.create(
             user=self.superuser,
-            action="DELETE",
+            action=AuditLog.Action.DELETE,
             model="Product",
             description="Deleted product"
         )
 
         self.client.login(username="admin", password="testpass123")
         response = self.client.get(
-            reverse("audit:audit-dashboard") + "?action=DELETE"
+            reverse("audit:audit-dashboard") + "?action=D"
         )
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "DELETE")
@@ -209,7 +287,7 @@ class AuditDashboardViewTest(TestCase):
         """Test filtering audit logs by model."""
         AuditLog.objects.create(
             user=self.superuser,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="Employee",
             description="Created employee"
         )
@@ -220,6 +298,91 @@ class AuditDashboardViewTest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_audit_dashboard_filter_by_module(self):
+        """Test filtering audit logs by module."""
+        AuditLog.objects.create(
+            user=self.superuser,
+            action=AuditLog.Action.CREATE,
+            model="FuelTank",
+            description="Created fuel tank"
+        )
+
+        self.client.login(username="admin", password="testpass123")
+        response = self.client.get(
+            reverse("audit:audit-dashboard") + "?module=fuel"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Created fuel tank")
+        self.assertNotContains(response, "Created product")
+
+    def test_audit_dashboard_unknown_filters_fall_back_to_all(self):
+        """Test unknown module/action values are treated as "all"."""
+        self.client.login(username="admin", password="testpass123")
+        response = self.client.get(
+            reverse("audit:audit-dashboard") + "?module=bogus&action=nope"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["module"], "all")
+        self.assertEqual(response.context["action"], "all")
+        self.assertContains(response, "Created product")
+
+    def test_audit_dashboard_keyset_pagination(self):
+        """Test ?before=&before_id= returns only rows older than the cursor."""
+        logs = list(AuditLog.objects.order_by("-timestamp", "-id"))
+        cursor = logs[1]
+
+        self.client.login(username="admin", password="testpass123")
+        response = self.client.get(reverse("audit:audit-dashboard"), {
+            "before": cursor.timestamp.isoformat(),
+            "before_id": cursor.id,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [log.id for log in response.context["logs"]],
+            [log.id for log in logs[2:]],
+        )
+        self.assertIsNone(response.context["next_before"])
+        self.assertEqual(response.context["prev_after_id"], logs[2].id)
+
+    @mock.patch("audit.views.LOGS_PER_PAGE", 2)
+    @mock.patch("audit.views.KEYSET_FROM_PAGE", 2)
+    def test_audit_dashboard_shallow_pages_stay_numbered(self):
+        """Test "Para" stays a numbered link before KEYSET_FROM_PAGE, then switches to the cursor."""
+        self.client.login(username="admin", password="testpass123")
+        url = reverse("audit:audit-dashboard")
+
+        response = self.client.get(url)
+        self.assertIsNone(response.context["next_before"])
+        self.assertContains(response, "?page=2&module=all")
+
+        response = self.client.get(url, {"page": 2})
+        logs = list(AuditLog.objects.order_by("-timestamp", "-id"))
+        self.assertEqual(response.context["next_before_id"], logs[3].id)
+
+    @mock.patch("audit.views.LOGS_PER_PAGE", 2)
+    def test_audit_dashboard_keyset_back_link(self):
+        """Test ?after=&after_id= returns the page just above a keyset page."""
+        self.client.login(username="admin", password="testpass123")
+        logs = list(AuditLog.objects.order_by("-timestamp", "-id"))
+        response = self.client.get(reverse("audit:audit-dashboard"), {
+            "after": logs[3].timestamp.isoformat(),
+            "after_id": logs[3].id,
+        })
+        self.assertEqual(
+            [log.id for log in response.context["logs"]],
+            [logs[1].id, logs[2].id],
+        )
+        self.assertEqual(response.context["prev_after_id"], logs[1].id)
+        self.assertEqual(response.context["next_before_id"], logs[2].id)
+        self.assertContains(response, "Mbrapa")
+
+        response = self.client.get(reverse("audit:audit-dashboard"), {
+            "after": logs[1].timestamp.isoformat(),
+            "after_id": logs[1].id,
+        })
+        self.assertEqual([log.id for log in response.context["logs"]], [logs[0].id])
+        self.assertIsNone(response.context["prev_after"])
+
 
 class AuditLogIntegrationTest(TestCase):
     """Integration tests for audit logging throughout the app."""
@@ -233,25 +396,29 @@ class AuditLogIntegrationTest(TestCase):
 
     def test_login_creates_audit_log(self):
         """Test that login creates an audit log entry."""
-        initial_count = AuditLog.objects.filter(action="LOGIN").count()
+        initial_count = AuditLog.objects.filter(action=AuditLog.Action.LOGIN).count()
 
-        self.client.post(reverse("accounts:login"), {
-            "username": "admin",
-            "password": "testpass123"
-        })
+        # The row is recorded once the request's transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("accounts:login"), {
+                "username": "admin",
+                "password": "testpass123"
+            })
 
         # Login signal should create audit log
-        final_count = AuditLog.objects.filter(action="LOGIN").count()
+        final_count = AuditLog.objects.filter(action=AuditLog.Action.LOGIN).count()
         self.assertEqual(final_count, initial_count + 1)
 
     def test_logout_creates_audit_log(self):
         """Test that logout creates an audit log entry."""
         self.client.login(username="admin", password="testpass123")
-        initial_count = AuditLog.objects.filter(action="LOGOUT").count()
+        initial_count = AuditLog.objects.filter(action=AuditLog.Action.LOGOUT).count()
 
-        self.client.post(reverse("accounts:logout"))
+        # The row is recorded once the request's transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("accounts:logout"))
 
-        final_count = AuditLog.objects.filter(action="LOGOUT").count()
+        final_count = AuditLog.objects.filter(action=AuditLog.Action.LOGOUT).count()
         self.assertEqual(final_count, initial_count + 1)
 
 
@@ -272,7 +439,7 @@ class AuditLogQueryTest(TestCase):
         for i in range(3):
             AuditLog.objects.create(
                 user=self.user1,
-                action="CREATE",
+                action=AuditLog.Action.CREATE,
                 model="Product",
                 description=f"User1 action {i}"
             )
@@ -281,7 +448,7 @@ class AuditLogQueryTest(TestCase):
         for i in range(2):
             AuditLog.objects.create(
                 user=self.user2,
-                action="UPDATE",
+                action=AuditLog.Action.UPDATE,
                 model="Employee",
                 description=f"User2 action {i}"
             )
@@ -293,7 +460,7 @@ class AuditLogQueryTest(TestCase):
 
     def test_filter_by_action(self):
         """Test filtering logs by action."""
-        create_logs = AuditLog.objects.filter(action="CREATE")
+        create_logs = AuditLog.objects.filter(action=AuditLog.Action.CREATE)
         self.assertEqual(create_logs.count(), 3)
 
     def test_filter_by_model(self):
@@ -1,5 +1,45 @@
+import logging
+import threading
+
+from django.db import connection, transaction
+
 from .models import AuditLog
 
+logger = logging.getLogger(__name__)
+
+# Rows logged during a request, written in one INSERT by AuditBufferMiddleware
+_local = threading.local()
+
+
+def start_buffering():
+    _local.pending = []
+
+
+def flush_pending():
+    """Close the buffer and insert its rows in one query."""
+    pending = getattr(_local, "pending", None)
+    _local.pending = None
+    if not pending:
+        return
+    try:
+        AuditLog.objects.bulk_create(pending)
+    except Exception:
+        # The change itself has committed: audit failures must never turn the
+        # user's response into a 500 (and invite a resubmit), so log what was lost
+        logger.exception(
+            "Failed to write %d audit log rows: %s",
+            len(pending),
+            ", ".join(f"{entry.model}/{entry.action}/{entry.object_id}" for entry in pending),
+        )
+
+
+def get_client_ip(request):
+    """Extract real client IP, checking X-Forwarded-For for proxied requests."""
+    xff = request.META.get("HTTP_X_FORWARDED_FOR")
+    # partition stops at the first comma instead of splitting the whole header
+    return xff.partition(",")[0].strip() if xff else request.META.get("REMOTE_ADDR")
+
+
 def log_action(
     *,
     user,
@@ -9,7 +49,7 @@ def log_action(
     description="",
     ip_address=None
 ):
-    AuditLog.objects.create(
+    entry = AuditLog(
         user=user,
         action=action,
         model=model,
@@ -17,3 +57,24 @@ def log_action(
         description=description,
         ip_address=ip_address,
     )
+    # Outside a request, insert immediately
+    if getattr(_local, "pending", None) is None:
+        entry.save()
+        return
+
+    # Inside a transaction: record the row only once the change it describes
+    # has committed, so the write stays out of the locked section and a
+    # rolled-back change leaves no log behind
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _record(entry))
+        return
+
+    _record(entry)
+
+
+def _record(entry):
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        entry.save()
+    else:
+        pending.append(entry)
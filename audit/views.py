@@ -1,11 +1,86 @@
 from django.shortcuts import render
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 from django.views.decorators.cache import never_cache
 
 from management.permissions import admin_required
 from .models import AuditLog
 
 LOGS_PER_PAGE = 50
+# Numbered (OFFSET) pages up to here; "Para" from this page on uses the keyset cursor
+KEYSET_FROM_PAGE = 10
+COUNT_CACHE_TTL = 30  # seconds
+
+# Audit "model" names grouped by dashboard module filter
+MODULE_MODELS = {
+    "inventory": (
+        "Depot",
+        "Product",
+        "WithdrawalItem",
+        "ReturnItem",
+        "WithdrawalHeader",
+        "ReturnHeader",
+    ),
+    "fuel": (
+        "FuelEntry",
+        "FuelUsage",
+        "FuelTank",
+        "Vehicle",
+    ),
+    "core": (
+        "Employee",
+        "Vehicle",
+    ),
+    "expenses": (
+        "EmployeeBudget",
+        "Expense",
+        "BudgetAdjustment",
+    ),
+    "management": (
+        "Employee",
+        "Vehicle",
+        "FuelTank",
+        "Depot",
+    ),
+}
+
+
+class FastCountPaginator(Paginator):
+    """
+    Paginator that avoids a COUNT(*) over the audit table per page hit: the
+    exact count is cached for COUNT_CACHE_TTL seconds under cache_key.
+    """
+
+    def __init__(self, object_list, per_page, *, cache_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        exact_count = Paginator.count.func
+        if self.cache_key is None:
+            return exact_count(self)
+        return cache.get_or_set(
+            self.cache_key, lambda: exact_count(self), COUNT_CACHE_TTL
+        )
+
+
+def _parse_cursor(request, name):
+    """(timestamp, id) of a row already shown, from ?<name>=&<name>_id=."""
+    value = request.GET.get(name)
+    value_id = request.GET.get(f"{name}_id", "")
+    if not value or not value_id.isdigit():
+        return None
+    try:
+        timestamp = parse_datetime(value)
+    except ValueError:
+        return None
+    if timestamp is None:
+        return None
+    return timestamp, int(value_id)
 
 
 @admin_required
@@ -13,61 +88,78 @@ LOGS_PER_PAGE = 50
 def audit_dashboard(request):
     module = request.GET.get("module", "all")
     action = request.GET.get("action", "all")
+    # Unknown values fall back to "all" (they also form the count cache key)
+    if module not in MODULE_MODELS:
+        module = "all"
+    if action not in AuditLog.Action.values:
+        action = "all"
 
-    logs = AuditLog.objects.select_related("user").order_by("-timestamp")
+    # Only the columns the table renders (skips the joined user's full row)
+    logs = (
+        AuditLog.objects.select_related("user")
+        .only("timestamp", "action", "model", "description", "ip_address", "user__username")
+        .order_by("-timestamp", "-id")
+    )
 
     # MODULE FILTER
-    if module == "inventory":
-        logs = logs.filter(model__in=[
-            "Depot",
-            "Product",
-            "WithdrawalItem",
-            "ReturnItem",
-            "WithdrawalHeader",
-            "ReturnHeader",
-        ])
-
-    elif module == "fuel":
-        logs = logs.filter(model__in=[
-            "FuelEntry",
-            "FuelUsage",
-            "FuelTank",
-            "Vehicle",
-        ])
-
-    elif module == "core":
-        logs = logs.filter(model__in=[
-            "Employee",
-            "Vehicle",
-        ])
-
-    elif module == "expenses":
-        logs = logs.filter(model__in=[
-            "EmployeeBudget",
-            "Expense",
-            "BudgetAdjustment",
-        ])
-
-    elif module == "management":
-        logs = logs.filter(model__in=[
-            "Employee",
-            "Vehicle",
-            "FuelTank",
-            "Depot",
-        ])
+    if module != "all":
+        logs = logs.filter(model__in=MODULE_MODELS[module])
 
     # ACTION FILTER
     if action != "all":
         logs = logs.filter(action=action)
 
     # PAGINATION
-    paginator = Paginator(logs, LOGS_PER_PAGE)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    # Keyset ("older/newer than a row already shown") for deep pages: an index
+    # range scan instead of OFFSET discarding every earlier row
+    before = _parse_cursor(request, "before")
+    after = None if before else _parse_cursor(request, "after")
+    page_obj = None
+    if before:
+        timestamp, row_id = before
+        rows = list(
+            logs.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=row_id))
+            [:LOGS_PER_PAGE + 1]
+        )
+        has_next, has_previous = len(rows) > LOGS_PER_PAGE, True
+        page_rows = rows[:LOGS_PER_PAGE]
+    elif after:
+        # "Mbrapa" from a keyset page: the newer rows just above it, fetched
+        # oldest-first and flipped back into display order
+        timestamp, row_id = after
+        rows = list(
+            logs.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=row_id))
+            .reverse()[:LOGS_PER_PAGE + 1]
+        )
+        has_next, has_previous = True, len(rows) > LOGS_PER_PAGE
+        page_rows = rows[:LOGS_PER_PAGE][::-1]
+    else:
+        paginator = FastCountPaginator(
+            logs, LOGS_PER_PAGE, cache_key=f"audit:count:{module}:{action}"
+        )
+        page_number = request.GET.get("page", 1)
+        page_obj = paginator.get_page(page_number)
+        has_next, has_previous = page_obj.has_next(), page_obj.has_previous()
+        page_rows = page_obj
+
+    next_before = next_before_id = None
+    if has_next and page_rows and (page_obj is None or page_obj.number >= KEYSET_FROM_PAGE):
+        last = page_rows[-1]
+        next_before, next_before_id = last.timestamp.isoformat(), last.id
+
+    prev_after = prev_after_id = None
+    if has_previous and page_rows and page_obj is None:
+        first = page_rows[0]
+        prev_after, prev_after_id = first.timestamp.isoformat(), first.id
 
     return render(request, "audit/dashboard.html", {
-        "logs": page_obj,
+        "logs": page_rows,
         "page_obj": page_obj,
+        "is_cursor_page": page_obj is None,
+        "next_before": next_before,
+        "next_before_id": next_before_id,
+        "prev_after": prev_after,
+        "prev_after_id": prev_after_id,
         "module": module,
         "action": action,
     })
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 01:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alter_employee_phone_alter_vehicle_chassis_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['is_active', 'have_budget'], name='emp_active_budget_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_employee_emp_active_budget_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='emp_active_budget_idx',
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['is_active', 'have_budget', 'name'], include=('id',), name='emp_budget_list_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_employee_budget_list_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['-is_active', 'name'], name='emp_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['-is_active', 'plate'], name='vehicle_active_plate_idx'),
+        ),
+    ]
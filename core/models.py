@@ -19,6 +19,14 @@ class Employee(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Staff expenses listing: filter + ORDER BY name, id read from the index (PostgreSQL INCLUDE)
+            models.Index(fields=["is_active", "have_budget", "name"], include=["id"], name="emp_budget_list_idx"),
+            # Management list: active first, then by name (one page read straight off the index)
+            models.Index(fields=["-is_active", "name"], name="emp_active_name_idx"),
+        ]
+
     def __str__(self):
         return self.name
     
@@ -37,5 +45,11 @@ class Vehicle(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Management list and the fuel vehicle sidebar: active first, then by plate
+            models.Index(fields=["-is_active", "plate"], name="vehicle_active_plate_idx"),
+        ]
+
     def __str__(self):
         return self.plate
@@ -121,6 +121,19 @@ class HomeViewTest(TestCase):
         response = self.client.get(reverse("core:home"))
         self.assertEqual(response.status_code, 200)
 
+    def test_root_permanently_redirects_to_home(self):
+        """Test site root issues a cacheable 301 to the home page."""
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(reverse("root"))
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response.url, reverse("core:home"))
+
+    def test_favicon_served_at_root_without_login(self):
+        """Test /favicon.ico is served directly as a small icon file, no redirect."""
+        response = self.client.get("/favicon.ico")
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(int(response["Content-Length"]), 10_000)
+
 
 class ErrorHandlersTest(TestCase):
     """Tests for custom error handlers."""
@@ -137,3 +150,27 @@ class ErrorHandlersTest(TestCase):
         self.client.login(username="testuser", password="testpass123")
         response = self.client.get("/nonexistent-page/")
         self.assertEqual(response.status_code, 404)
+
+    def test_anonymous_404_reuses_rendered_body(self):
+        """Test anonymous 404 pages are served from the cached render."""
+        first = self.client.get("/static/missing-file.css")
+        second = self.client.get("/static/other-missing-file.css")
+        self.assertEqual(first.status_code, 404)
+        self.assertEqual(second.status_code, 404)
+        self.assertEqual(first.content, second.content)
+        self.assertNotContains(second, "testuser", status_code=404)
+
+
+class GroupNamesCacheTest(TestCase):
+    """Tests for the get_group_names helper."""
+
+    def test_groups_fetched_once_per_user_object(self):
+        """Test repeated group checks on one user issue a single query."""
+        from core.utils import get_group_names
+
+        user = User.objects.create_user(username="staffer", password="testpass123")
+        user.groups.add(Group.objects.get_or_create(name="staff")[0])
+
+        with self.assertNumQueries(1):
+            self.assertIn("staff", get_group_names(user))
+            self.assertNotIn("employee", get_group_names(user))
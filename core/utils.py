@@ -0,0 +1,5 @@
+def get_group_names(user):
+    """Names of the user's groups, fetched once and cached on the user object."""
+    if not hasattr(user, "_cached_group_names"):
+        user._cached_group_names = set(user.groups.values_list("name", flat=True))
+    return user._cached_group_names
@@ -1,8 +1,12 @@
 import logging
 
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse
 from django.shortcuts import render
 from django.views.decorators.cache import never_cache
 
+from accounts.middleware import LOGIN_PATH
+
 logger = logging.getLogger("django.security.csrf")
 
 
@@ -15,16 +19,32 @@ def csrf_failure(request, reason=""):
     )
     return render(request, "core/csrf_failed.html", {"reason": reason}, status=403)
 
+# Rendered error pages for anonymous visitors (no navbar, username or CSRF token,
+# so the body is identical for every request)
+_ANON_ERROR_BODIES = {}
+
+
+def _error_response(request, template_name, status):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return render(request, template_name, status=status)
+
+    body = _ANON_ERROR_BODIES.get(template_name)
+    if body is None:
+        body = _ANON_ERROR_BODIES[template_name] = render(request, template_name).content
+    return HttpResponse(body, status=status)
+
 def permission_denied_view(request, exception=None):
-    return render(request, "core/403.html", status=403)
+    return _error_response(request, "core/403.html", 403)
 
 def page_not_found_view(request, exception=None):
-    return render(request, "core/404.html", status=404)
+    return _error_response(request, "core/404.html", 404)
 
 def server_error_view(request):
-    return render(request, "core/500.html", status=500)
+    return _error_response(request, "core/500.html", 500)
 
 
 @never_cache
+@login_required(login_url=LOGIN_PATH)
 def home(request):
     return render(request, "core/home.html")
@@ -1,43 +1,76 @@
 from django import forms
+from django.forms.models import ModelChoiceIterator
 from .models import Expense, BudgetAdjustment
 from core.models import Employee
 
+
+class _EmployeeNameIterator(ModelChoiceIterator):
+    """Options straight from values_list: no Employee instance or __str__ per <option>."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self.queryset.values_list("pk", "name")
+
+
+class EmployeeChoiceField(forms.ModelChoiceField):
+    iterator = _EmployeeNameIterator
+
+
+def _employee_field():
+    """
+    Active employees with budget access, declared on the form class so
+    __init__ no longer rebuilds the queryset per instance (the lazy
+    queryset is cloned per form and hits the DB only on render/validation).
+    """
+    return EmployeeChoiceField(
+        # Validation only needs pk + name
+        queryset=(
+            Employee.objects.filter(is_active=True, have_budget=True)
+            .only("id", "name")
+            .order_by("name")
+        ),
+        label="Emri",
+        empty_label="Zgjidh punonjësin",
+        widget=forms.Select(attrs={"class": "form-control"}),
+    )
+
+
 class ExpenseForm(forms.ModelForm):
+    employee = _employee_field()
+
     class Meta:
         model = Expense
         fields = ["employee", "description", "amount", "date"]
         labels = {
-            "employee": "Emri",
             "description": "Përshkrimi",
             "amount": "Shuma",
             "date": "Data",
         }
         widgets = {
-            "employee": forms.Select(attrs={"class": "form-control"}),
-            "description": forms.TextInput(attrs={"class": "form-control"}),
+            "description": forms.TextInput(attrs={"class": "form-control", "maxlength": "255"}),
             "amount": forms.NumberInput(attrs={"class": "form-control"}),
             "date": forms.DateInput(attrs={"type": "date", "class": "form-control"}),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
 
-        # Show only active employees with budget access
-        self.fields["employee"].queryset = (
-            Employee.objects.filter(is_active=True, have_budget=True).order_by("name")
-        )
+class SelfExpenseForm(ExpenseForm):
+    """Expense for the logged-in employee: no employee picker at all."""
 
-        # Placeholder option at top
-        self.fields["employee"].empty_label = "Zgjidh punonjësin"
+    employee = None
+
+    class Meta(ExpenseForm.Meta):
+        fields = ["description", "amount", "date"]
 
 
 class BudgetAdjustmentForm(forms.ModelForm):
+    employee = _employee_field()
+
     class Meta:
         model = BudgetAdjustment
         fields = ["employee", "adjustment_type", "amount", "date", "note"]
 
         labels = {
-            "employee": "Emri",
             "adjustment_type": "Shto / Zbrit",
             "amount": "Shuma",
             "date": "Data",
@@ -45,21 +78,9 @@ class BudgetAdjustmentForm(forms.ModelForm):
         }
 
         widgets = {
-            "employee": forms.Select(attrs={"class": "form-control"}),
             "adjustment_type": forms.Select(attrs={"class": "form-control"}),
-            "amount": forms.NumberInput(attrs={"class": "form-control", "min": "0"}),
+            "amount": forms.NumberInput(attrs={"class": "form-control", "min": "1"}),
             "date": forms.DateInput(attrs={"type": "date", "class": "form-control"}),
-            "note": forms.TextInput(attrs={"class": "form-control"}),
+            "note": forms.TextInput(attrs={"class": "form-control", "maxlength": "255"}),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Only active employees with budget access
-        self.fields["employee"].queryset = (
-            Employee.objects.filter(is_active=True, have_budget=True).order_by("name")
-        )
-
-        # Placeholder
-        self.fields["employee"].empty_label = "Zgjidh punonjësin"
-
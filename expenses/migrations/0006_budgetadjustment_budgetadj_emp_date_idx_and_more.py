@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-15 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_employee_emp_active_budget_idx'),
+        ('expenses', '0005_alter_budgetadjustment_note'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='budgetadjustment',
+            index=models.Index(fields=['employee', '-date', '-id'], name='budgetadj_emp_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['employee', '-date', '-id'], name='expense_emp_date_idx'),
+        ),
+    ]
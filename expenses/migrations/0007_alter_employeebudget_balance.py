@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0006_budgetadjustment_budgetadj_emp_date_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employeebudget',
+            name='balance',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
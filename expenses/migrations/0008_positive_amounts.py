@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-15 01:55
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def check_amounts(apps, schema_editor):
+    """
+    Stop before the schema change if any amount is zero or negative. Amounts
+    feed the employee balances, so they are not rewritten here; fix or remove
+    the listed rows by hand, then run the migration again.
+    """
+    bad = []
+    for model_name in ("Expense", "BudgetAdjustment"):
+        model = apps.get_model("expenses", model_name)
+        ids = list(model.objects.filter(amount__lte=0).values_list("id", flat=True)[:20])
+        if ids:
+            bad.append(f"{model_name} ids {ids}")
+    if bad:
+        raise RuntimeError(
+            "Amounts must be positive before expenses.0008 can add its constraints: "
+            + "; ".join(bad)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_employee_emp_active_budget_idx'),
+        ('expenses', '0007_alter_employeebudget_balance'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_amounts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='budgetadjustment',
+            name='amount',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AlterField(
+            model_name='expense',
+            name='amount',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddConstraint(
+            model_name='budgetadjustment',
+            constraint=models.CheckConstraint(condition=models.Q(('amount__gt', 0)), name='budgetadj_amount_positive'),
+        ),
+        migrations.AddConstraint(
+            model_name='expense',
+            constraint=models.CheckConstraint(condition=models.Q(('amount__gt', 0)), name='expense_amount_positive'),
+        ),
+    ]
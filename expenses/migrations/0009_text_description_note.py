@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 02:10
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0008_positive_amounts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='budgetadjustment',
+            name='note',
+            field=models.TextField(blank=True, validators=[django.core.validators.MaxLengthValidator(255)]),
+        ),
+        migrations.AlterField(
+            model_name='expense',
+            name='description',
+            field=models.TextField(validators=[django.core.validators.MaxLengthValidator(255)]),
+        ),
+    ]
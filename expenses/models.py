@@ -1,7 +1,7 @@
-from django.db import models, transaction
+from django.db import models
+from django.db.models import Q
 from django.utils import timezone
-from django.core.validators import MinValueValidator
-from decimal import Decimal
+from django.core.validators import MaxLengthValidator, MinValueValidator
 
 class EmployeeBudget(models.Model):
     """
@@ -12,7 +12,7 @@ class EmployeeBudget(models.Model):
         on_delete=models.CASCADE,
         related_name="budget"
     )
-    balance = models.IntegerField(default=0)
+    balance = models.BigIntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -25,11 +25,21 @@ class Expense(models.Model):
         on_delete=models.CASCADE,
         related_name="expenses"
     )
-    description = models.CharField(max_length=255)
-    amount = models.IntegerField()
+    # text + validator: same storage as varchar, without the width in planner estimates
+    description = models.TextField(validators=[MaxLengthValidator(255)])
+    amount = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     date = models.DateField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Employee detail lists expenses newest first
+        indexes = [
+            models.Index(fields=["employee", "-date", "-id"], name="expense_emp_date_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=Q(amount__gt=0), name="expense_amount_positive"),
+        ]
+
     def __str__(self):
         return f"{self.employee.name} - {self.amount} on {self.date}"
 
@@ -48,11 +58,19 @@ class BudgetAdjustment(models.Model):
         related_name="budget_adjustments"
     )
     adjustment_type = models.CharField(max_length=10, choices=TYPE_CHOICES ,default=ADD)
-    amount = models.IntegerField()
+    amount = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     date = models.DateField(default=timezone.now)
-    note = models.CharField(max_length=255, blank=True)
+    note = models.TextField(blank=True, validators=[MaxLengthValidator(255)])
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["employee", "-date", "-id"], name="budgetadj_emp_date_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=Q(amount__gt=0), name="budgetadj_amount_positive"),
+        ]
+
     def __str__(self):
         sign = "+" if self.adjustment_type == self.ADD else "-"
         return f"{self.employee.name} {sign}{self.amount} ({self.date})"
@@ -1,12 +1,12 @@
 from functools import wraps
 from django.core.exceptions import PermissionDenied
-from core.models import Employee
+from core.utils import get_group_names
 
 
 def is_staff_user(user) -> bool:
     """RBAC staff: superuser OR in group 'staff'."""
     return user.is_authenticated and (
-        user.is_superuser or user.groups.filter(name="staff").exists()
+        user.is_superuser or "staff" in get_group_names(user)
     )
 
 
@@ -19,9 +19,10 @@ def budget_required(view_func):
         if is_staff_user(user):
             return view_func(request, *args, **kwargs)
 
-        # Must have Employee + have_budget=True
-        employee = Employee.objects.filter(user=user, is_active=True).first()
-        if not employee:
+        # Must have an active Employee + have_budget=True
+        # (reverse OneToOne is cached on the user for the rest of the request)
+        employee = getattr(user, "employee", None)
+        if employee is None or not employee.is_active:
             raise PermissionDenied("This user is not linked to any Employee.")
         if not employee.have_budget:
             raise PermissionDenied("This employee has no budget access.")
@@ -1,12 +1,12 @@
 """
 Tests for the Expenses app - Budgets, expenses, and adjustments.
 """
-from django.test import TestCase, Client, TransactionTestCase
+from django.test import TestCase, Client
 from django.contrib.auth.models import User, Group
 from django.urls import reverse
 from core.models import Employee
 from expenses.models import EmployeeBudget, Expense, BudgetAdjustment
-from expenses.forms import ExpenseForm, BudgetAdjustmentForm
+from expenses.forms import ExpenseForm, SelfExpenseForm, BudgetAdjustmentForm
 
 
 class EmployeeBudgetModelTest(TestCase):
@@ -138,21 +138,22 @@ class BudgetAdjustmentModelTest(TestCase):
         self.assertIn("500", result)
 
 
-class BudgetCalculationTest(TransactionTestCase):
+class BudgetCalculationTest(TestCase):
     """Tests for budget calculation business logic."""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username="testuser",
             password="testpass123"
         )
-        self.employee = Employee.objects.create(
-            user=self.user,
+        cls.employee = Employee.objects.create(
+            user=cls.user,
             name="Test Employee",
             have_budget=True
         )
-        self.budget = EmployeeBudget.objects.create(
-            employee=self.employee,
+        cls.budget = EmployeeBudget.objects.create(
+            employee=cls.employee,
             balance=1000
         )
 
@@ -305,6 +306,14 @@ class ExpenseViewTest(TestCase):
         response = self.client.get(reverse("expenses:expenses-home"))
         self.assertEqual(response.status_code, 200)
 
+    def test_expenses_home_loads_card_fields_only(self):
+        """Test the staff listing loads only the columns the cards render."""
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(reverse("expenses:expenses-home"))
+        employee = response.context["employees"][0]
+        self.assertIn("position", employee.get_deferred_fields())
+        self.assertEqual(employee.balance, 1000)
+
     def test_employee_detail_view(self):
         """Test employee expense detail view."""
         self.client.login(username="staffuser", password="testpass123")
@@ -313,6 +322,34 @@ class ExpenseViewTest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_budget_adjustments_view(self):
+        """Test budget adjustments page loads the employee's budget."""
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(
+            reverse("expenses:expenses-budget-adjustments", args=[self.staff_employee.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["budget"], self.staff_budget)
+
+    def test_employee_detail_expenses(self):
+        """Test employee detail lists the expenses and loads the budget."""
+        Expense.objects.bulk_create([
+            Expense(
+                employee=self.staff_employee,
+                description="Test expense",
+                amount=amount
+            )
+            for amount in (100, 250)
+        ])
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(
+            reverse("expenses:expenses-employee-detail", args=[self.staff_employee.pk])
+        )
+        self.assertEqual(
+            sorted(expense.amount for expense in response.context["expenses"]), [100, 250]
+        )
+        self.assertEqual(response.context["budget"], self.staff_budget)
+
 
 class ExpenseFormTest(TestCase):
     """Tests for expense form."""
@@ -361,8 +398,19 @@ class ExpenseFormTest(TestCase):
             "amount": 0
         }
         form = ExpenseForm(data=form_data)
-        # Depends on form validation rules
-        # At minimum, the form should handle this case
+        self.assertFalse(form.is_valid())
+        self.assertIn("amount", form.errors)
+
+    def test_self_expense_form_has_no_employee_field(self):
+        """Test the self-service form validates without an employee picker."""
+        from datetime import date
+        form = SelfExpenseForm(data={
+            "description": "Test expense",
+            "amount": 100,
+            "date": date.today()
+        })
+        self.assertNotIn("employee", form.fields)
+        self.assertTrue(form.is_valid())
 
 
 class BudgetAdjustmentFormTest(TestCase):
@@ -425,3 +473,13 @@ class BudgetAdjustmentFormTest(TestCase):
 
         # Should include active employee
         self.assertIn(self.employee, employee_choices)
+
+    def test_employee_choices_render_from_values(self):
+        """Test dropdown options are (pk, name) pairs fetched in one query."""
+        form = BudgetAdjustmentForm()
+        with self.assertNumQueries(1):
+            choices = [choice for choice in form.fields["employee"].choices]
+        self.assertEqual(
+            choices,
+            [("", "Zgjidh punonjësin"), (self.employee.pk, "Test Employee")]
+        )
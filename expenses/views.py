@@ -1,18 +1,19 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.db import transaction
-from django.db.models import Sum, OuterRef, Subquery
+from django.db.models import F, OuterRef, Subquery
 from django.core.exceptions import PermissionDenied
+from django.utils import timezone
 from django.views.decorators.cache import never_cache
 
 from accounts.decorators import staff_or_own_employee_detail
-from audit.utils import log_action
-from audit.middleware import get_client_ip
+from audit.models import AuditLog
+from audit.utils import get_client_ip, log_action
 from management.permissions import staff_required, employee_required
 from .permissions import budget_required, is_staff_user
 
 from core.models import Employee
 from .models import EmployeeBudget, Expense, BudgetAdjustment
-from .forms import ExpenseForm, BudgetAdjustmentForm
+from .forms import ExpenseForm, SelfExpenseForm, BudgetAdjustmentForm
 
 
 # ==========================
@@ -30,23 +31,23 @@ def get_logged_employee(request):
         raise PermissionDenied("This user is not linked to any Employee.")
 
 
-def _get_or_create_budget(employee: Employee, lock: bool = False) -> EmployeeBudget:
-    if lock:
-        # Try to get with lock first
-        budget = EmployeeBudget.objects.select_for_update().filter(employee=employee).first()
-        if budget:
-            return budget
-    # Create if doesn't exist (or get without lock)
+def _get_or_create_budget(employee: Employee) -> EmployeeBudget:
     budget, _ = EmployeeBudget.objects.get_or_create(
         employee=employee,
         defaults={"balance": 0},
     )
-    if lock and budget:
-        # Re-fetch with lock if we just created it
-        budget = EmployeeBudget.objects.select_for_update().get(pk=budget.pk)
     return budget
 
 
+def _apply_balance_delta(budget: EmployeeBudget, delta: int) -> None:
+    """Atomic UPDATE balance = balance + delta (no read-modify-write, no lost updates)."""
+    EmployeeBudget.objects.filter(pk=budget.pk).update(
+        balance=F("balance") + delta,
+        updated_at=timezone.now(),
+    )
+    budget.refresh_from_db(fields=["balance", "updated_at"])
+
+
 # ==========================
 # VIEWS
 # ==========================
@@ -66,6 +67,7 @@ def expenses_home(request):
             Employee.objects
             .filter(have_budget=True , is_active=True)
             .order_by("name")
+            .only("id", "name")  # the cards render only name, id and balance
             .annotate(balance=Subquery(budget_subq))
         )
 
@@ -79,13 +81,15 @@ def expenses_home(request):
 @staff_or_own_employee_detail
 @budget_required
 def employee_detail(request, employee_id):
-    employee = get_object_or_404(Employee, id=employee_id)
-    budget = _get_or_create_budget(employee)
+    employee = get_object_or_404(Employee.objects.select_related("budget"), id=employee_id)
+    budget = getattr(employee, "budget", None) or _get_or_create_budget(employee)
 
-    expenses = Expense.objects.filter(employee=employee).order_by("-date", "-id")
-    adjustments = BudgetAdjustment.objects.filter(employee=employee).order_by("-date", "-id")
-
-    total_expenses = expenses.aggregate(total=Sum("amount"))["total"] or 0
+    expenses = (
+        Expense.objects.filter(employee_id=employee.id)
+        .only("id", "date", "amount", "description")
+        .order_by("-date", "-id")
+    )
+    adjustments = BudgetAdjustment.objects.filter(employee_id=employee.id).order_by("-date", "-id")
 
     can_add_expense = False
     if request.user.is_superuser:
@@ -99,7 +103,6 @@ def employee_detail(request, employee_id):
         "budget": budget,
         "expenses": expenses,
         "adjustments": adjustments,
-        "total_expenses": total_expenses,
         "can_add_expense": can_add_expense,
     })
 
@@ -107,10 +110,14 @@ def employee_detail(request, employee_id):
 @staff_or_own_employee_detail
 @budget_required
 def budget_adjustments(request, employee_id):
-    employee = get_object_or_404(Employee, id=employee_id)
-    budget = _get_or_create_budget(employee)
+    employee = get_object_or_404(Employee.objects.select_related("budget"), id=employee_id)
+    budget = getattr(employee, "budget", None) or _get_or_create_budget(employee)
 
-    adjustments = BudgetAdjustment.objects.filter(employee=employee).order_by("-date", "-id")
+    adjustments = (
+        BudgetAdjustment.objects.filter(employee=employee)
+        .only("id", "date", "adjustment_type", "amount", "note")
+        .order_by("-date", "-id")
+    )
 
     return render(request, "expenses/budget_adjustments.html", {
         "employee": employee,
@@ -126,11 +133,9 @@ def add_expense(request):
     # ✅ Only superuser can add expense to other employees
     admin_mode = request.user.is_superuser
 
-    form = ExpenseForm(request.POST or None)
-
-    # ✅ If NOT superuser (including staff): remove employee picker BEFORE validation
-    if not admin_mode and "employee" in form.fields:
-        form.fields.pop("employee")
+    # ✅ If NOT superuser (including staff): form without the employee picker
+    form_class = ExpenseForm if admin_mode else SelfExpenseForm
+    form = form_class(request.POST or None)
 
     if request.method == "POST" and form.is_valid():
         with transaction.atomic():
@@ -146,16 +151,14 @@ def add_expense(request):
                 employee = get_logged_employee(request)
                 expense.employee = employee
 
-            # Lock budget row to prevent race conditions
-            budget = _get_or_create_budget(employee, lock=True)
+            budget = _get_or_create_budget(employee)
 
             expense.save()
-            budget.balance = budget.balance - expense.amount
-            budget.save()
+            _apply_balance_delta(budget, -expense.amount)
 
             log_action(
                 user=request.user,
-                action="CREATE",
+                action=AuditLog.Action.CREATE,
                 model="Expense",
                 object_id=str(expense.id),
                 description=(
@@ -180,21 +183,16 @@ def adjust_budget(request):
         with transaction.atomic():
             adj = form.save(commit=False)
 
-            # Lock budget row to prevent race conditions
-            budget = _get_or_create_budget(adj.employee, lock=True)
-
-            if adj.adjustment_type == BudgetAdjustment.ADD:
-                budget.balance = budget.balance + adj.amount
-            else:
-                # allow going negative
-                budget.balance = budget.balance - adj.amount
+            budget = _get_or_create_budget(adj.employee)
 
             adj.save()
-            budget.save()
+            # REMOVE may take the balance negative
+            delta = adj.amount if adj.adjustment_type == BudgetAdjustment.ADD else -adj.amount
+            _apply_balance_delta(budget, delta)
 
             log_action(
                 user=request.user,
-                action="ADJUST",
+                action=AuditLog.Action.ADJUST,
                 model="BudgetAdjustment",
                 object_id=str(adj.id),
                 description=(
@@ -1,9 +1,7 @@
 # fuel/forms.py
 from django import forms
-from .models import FuelEntry, FuelUsage, FuelTank
+from .models import FuelEntry, FuelUsage, first_tank_id
 from core.models import Vehicle , Employee
-from django.db.models import Sum, Value
-from django.db.models.functions import Coalesce
 
 
 class FuelEntryForm(forms.ModelForm):
@@ -19,9 +17,9 @@ class FuelEntryForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        first_tank = FuelTank.objects.first()
-        if first_tank:
-            self.fields['tank'].initial = first_tank
+        tank_id = first_tank_id()
+        if tank_id:
+            self.fields['tank'].initial = tank_id
 
 
 class FuelUsageForm(forms.ModelForm):
@@ -52,9 +50,9 @@ class FuelUsageForm(forms.ModelForm):
 
         # default tank (opsionale)
         if "tank" in self.fields:
-            first_tank = FuelTank.objects.first()
-            if first_tank:
-                self.fields["tank"].initial = first_tank
+            tank_id = first_tank_id()
+            if tank_id:
+                self.fields["tank"].initial = tank_id
 
     def clean(self):
         cleaned_data = super().clean()
@@ -68,28 +66,14 @@ class FuelUsageForm(forms.ModelForm):
             raise forms.ValidationError("Sasia duhet të jetë më e madhe se 0.")
 
         # ✅ open refill
-        open_refill = (
-            FuelEntry.objects
-            .filter(tank=tank, is_closed=False)
-            .order_by("-date", "-id")
-            .first()
-        )
-        if not open_refill:
+        if not tank.open_refill_id:
             raise forms.ValidationError(
                 "Nuk ka refill aktiv (OPEN) për këtë depo. "
                 "Shto një furnizim të ri dhe provo përsëri."
             )
 
         # calculate tank level
-        entries_total = FuelEntry.objects.filter(tank=tank).aggregate(
-            total=Coalesce(Sum("amount"), Value(0))
-        )["total"]
-
-        usage_total = FuelUsage.objects.filter(tank=tank).aggregate(
-            total=Coalesce(Sum("amount"), Value(0))
-        )["total"]
-
-        tank_level = entries_total - usage_total
+        tank_level = tank.current_level
 
         projected_level = tank_level - amount
         if projected_level < -self.MAX_NEGATIVE_LITERS:
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:33
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_current_level(apps, schema_editor):
+    FuelTank = apps.get_model("fuel", "FuelTank")
+    FuelEntry = apps.get_model("fuel", "FuelEntry")
+    FuelUsage = apps.get_model("fuel", "FuelUsage")
+    for tank in FuelTank.objects.all():
+        entries_total = FuelEntry.objects.filter(tank=tank).aggregate(total=Sum("amount"))["total"] or 0
+        usage_total = FuelUsage.objects.filter(tank=tank).aggregate(total=Sum("amount"))["total"] or 0
+        FuelTank.objects.filter(pk=tank.pk).update(current_level=entries_total - usage_total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fuel', '0004_alter_fuelentry_options_alter_fuelentry_tank_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fueltank',
+            name='current_level',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_current_level, migrations.RunPython.noop),
+    ]
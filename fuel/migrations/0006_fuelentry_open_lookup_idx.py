@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fuel', '0005_fueltank_current_level'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fuelentry',
+            index=models.Index(fields=['tank', 'is_closed', '-date', '-id'], name='fuelentry_open_lookup_idx'),
+        ),
+    ]
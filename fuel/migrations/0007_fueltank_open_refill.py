@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_open_refill(apps, schema_editor):
+    FuelTank = apps.get_model("fuel", "FuelTank")
+    FuelEntry = apps.get_model("fuel", "FuelEntry")
+    for entry in FuelEntry.objects.filter(is_closed=False).only("id", "tank_id"):
+        FuelTank.objects.filter(pk=entry.tank_id).update(open_refill=entry)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fuel', '0006_fuelentry_open_lookup_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fueltank',
+            name='open_refill',
+            field=models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='fuel.fuelentry'),
+        ),
+        migrations.RunPython(backfill_open_refill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_employee_budget_list_idx'),
+        ('fuel', '0007_fueltank_open_refill'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fuelusage',
+            index=models.Index(fields=['refill', '-date', '-id'], name='fuelusage_refill_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelusage',
+            index=models.Index(fields=['-date', '-id'], name='fuelusage_date_idx'),
+        ),
+    ]
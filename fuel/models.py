@@ -1,20 +1,65 @@
+from collections import defaultdict
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.utils.timezone import now
 
+from core.models import Employee, Vehicle
+
+
+def first_tank_id():
+    """Pk of the default tank for the fuel forms (None if there is none)."""
+    return FuelTank.objects.values_list("id", flat=True).first()
+
+
+# close_refill books the leftover on these
+def _id_by_name_or_first(model, field, value):
+    ids = model.objects.values_list("id", flat=True)
+    return ids.filter(**{f"{field}__iexact": value}).first() or ids.order_by("id").first()
+
+
+def teprica_operator_id():
+    """Pk of the SYSTEM employee, else the first employee (None if there is none)."""
+    return _id_by_name_or_first(Employee, "name", "SYSTEM")
+
+
+def teprica_vehicle_id():
+    """Pk of the DIFERENCE vehicle, else the first vehicle (None if there is none)."""
+    return _id_by_name_or_first(Vehicle, "plate", "DIFERENCE")
+
 
 class FuelTank(models.Model):
     name = models.CharField(max_length=50, default='Tank 1')
     capacity = models.PositiveIntegerField()
 
+    # Entries minus usage, kept in step by fuel.signals
+    current_level = models.IntegerField(default=0, editable=False)
+
+    # The single OPEN refill (see unique_open_refill_per_tank), kept by fuel.signals
+    open_refill = models.OneToOneField(
+        "fuel.FuelEntry",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
+
+    # Written only by fuel.signals via queryset update()
+    SIGNAL_FIELDS = ("current_level", "open_refill")
+
     def __str__(self):
         return self.name
 
-    @property
-    def current_level(self):
-        entries_total = self.entries.aggregate(total=models.Sum('amount'))['total'] or 0
-        usage_total = self.fuelusage_set.aggregate(total=models.Sum('amount'))['total'] or 0
-        return entries_total - usage_total
+    def save(self, *args, **kwargs):
+        # a stale in-memory copy must never overwrite the signal-maintained
+        # columns on a plain save()
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.SIGNAL_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     
 
@@ -46,21 +91,44 @@ class FuelEntry(models.Model):
                 name="unique_open_refill_per_tank",
             )
         ]
+        indexes = [
+            # Open-refill lookup: filter(tank, is_closed=False).order_by("-date", "-id")
+            models.Index(fields=["tank", "is_closed", "-date", "-id"], name="fuelentry_open_lookup_idx"),
+        ]
 
     def __str__(self):
         status = "CLOSED" if self.is_closed else "OPEN"
         return f"Refill {self.amount}L — {self.tank} — {self.date} ({status})"
 
+    @classmethod
+    def bulk_register(cls, entries_data, batch_size=1000):
+        """
+        Insert many refills in batched INSERTs (e.g. an import script).
+        bulk_create skips fuel.signals, so the tank columns they maintain
+        are brought up to date here with one F() UPDATE per tank.
+        """
+        entries = [cls(**data) for data in entries_data]
+        with transaction.atomic():
+            cls.objects.bulk_create(entries, batch_size=batch_size)
+
+            added = defaultdict(int)
+            for entry in entries:
+                added[entry.tank_id] += entry.amount
+            for tank_id, amount in added.items():
+                FuelTank.objects.filter(pk=tank_id).update(current_level=F("current_level") + amount)
+
+            for entry in entries:
+                if not entry.is_closed:
+                    FuelTank.objects.filter(pk=entry.tank_id).update(open_refill=entry)
+        return entries
+
     @property
     def used_amount(self) -> int:
         # ✅ total liters used that are linked to THIS refill
-        # relies on FuelUsage.refill ForeignKey with related_name="usages" (recommended)
-        if hasattr(self, "usages"):
-            total = self.usages.aggregate(total=models.Sum("amount"))["total"] or 0
-            return int(total)
-
-        # fallback if you didn't add related_name on FuelUsage.refill
-        total = self.fuelusage_set.aggregate(total=models.Sum("amount"))["total"] or 0
+        # listings annotate used_total=Coalesce(Sum("usages__amount"), 0) to skip the per-row SUM
+        if hasattr(self, "used_total"):
+            return int(self.used_total)
+        total = self.usages.aggregate(total=models.Sum("amount"))["total"] or 0
         return int(total)
 
     @property
@@ -79,6 +147,15 @@ class FuelUsage(models.Model):
 
     project = models.CharField(max_length=100, blank=True)
     operator = models.ForeignKey('core.Employee', on_delete=models.PROTECT)
+
+    class Meta:
+        indexes = [
+            # Refill detail: filter(refill=...).order_by("-date", "-id")
+            models.Index(fields=["refill", "-date", "-id"], name="fuelusage_refill_date_idx"),
+            # Fuel home usage table: order_by("-date", "-id")
+            models.Index(fields=["-date", "-id"], name="fuelusage_date_idx"),
+        ]
+
     def __str__(self):
         return f"Used {self.amount} L on {self.date}"
 
@@ -0,0 +1,69 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import FuelEntry, FuelTank, FuelUsage
+
+# Refills add to the tank, usages draw from it
+_LEVEL_SIGN = {FuelEntry: 1, FuelUsage: -1}
+
+
+def _shift_level(instance, tank_id, delta):
+    if not delta:
+        return
+    # Single UPDATE ... SET current_level = current_level + delta: no read-modify-write race
+    FuelTank.objects.filter(pk=tank_id).update(current_level=F("current_level") + delta)
+
+    # Keep an already loaded tank (e.g. usage.tank) in step with the row
+    tank = instance._meta.get_field("tank").get_cached_value(instance, None)
+    if tank is not None and tank.pk == tank_id:
+        level = FuelTank.objects.filter(pk=tank_id).values_list("current_level", flat=True).first()
+        if level is not None:
+            tank.current_level = level
+
+
+@receiver(pre_save, sender=FuelEntry)
+@receiver(pre_save, sender=FuelUsage)
+def remember_previous_amount(sender, instance, update_fields=None, **kwargs):
+    instance._level_before = None
+    if update_fields is not None and not {"tank", "amount"} & set(update_fields):
+        # e.g. close_refill's save(update_fields=["is_closed", "closed_at"]):
+        # tank and amount are not written, so no need to read them back
+        instance._level_before = (instance.tank_id, instance.amount)
+    elif not instance._state.adding:
+        instance._level_before = (
+            sender.objects.filter(pk=instance.pk).values_list("tank_id", "amount").first()
+        )
+
+
+@receiver(post_save, sender=FuelEntry)
+@receiver(post_save, sender=FuelUsage)
+def apply_level_change(sender, instance, **kwargs):
+    sign = _LEVEL_SIGN[sender]
+    before = getattr(instance, "_level_before", None)
+
+    if before and before[0] != instance.tank_id:
+        old_tank_id, old_amount = before
+        _shift_level(instance, old_tank_id, -sign * old_amount)
+        before = None
+
+    delta = instance.amount - (before[1] if before else 0)
+    _shift_level(instance, instance.tank_id, sign * delta)
+
+
+@receiver(post_save, sender=FuelEntry)
+def track_open_refill(sender, instance, **kwargs):
+    before = getattr(instance, "_level_before", None)
+    if before and before[0] != instance.tank_id:
+        FuelTank.objects.filter(pk=before[0], open_refill=instance).update(open_refill=None)
+
+    if instance.is_closed:
+        FuelTank.objects.filter(pk=instance.tank_id, open_refill=instance).update(open_refill=None)
+    else:
+        FuelTank.objects.filter(pk=instance.tank_id).update(open_refill=instance)
+
+
+@receiver(post_delete, sender=FuelEntry)
+@receiver(post_delete, sender=FuelUsage)
+def revert_level_change(sender, instance, **kwargs):
+    _shift_level(instance, instance.tank_id, -_LEVEL_SIGN[sender] * instance.amount)
@@ -1,13 +1,19 @@
 """
 Tests for the Fuel app - Fuel tanks, entries, and usage tracking.
 """
+from unittest import mock
+
 from django.test import TestCase, Client, TransactionTestCase
 from django.contrib.auth.models import User, Group
 from django.urls import reverse
-from django.db import IntegrityError
+from django.test.utils import CaptureQueriesContext
+from django.db import IntegrityError, connection
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce
 from core.models import Employee, Vehicle
 from fuel.models import FuelTank, FuelEntry, FuelUsage
 from fuel.forms import FuelEntryForm, FuelUsageForm
+from fuel.views import ENTRIES_PER_PAGE
 
 
 class FuelTankModelTest(TestCase):
@@ -62,6 +68,76 @@ class FuelTankModelTest(TestCase):
 
         self.assertEqual(tank.current_level, 700)
 
+    def test_fuel_tank_current_level_is_stored(self):
+        """Test current level is read from the tank row, not aggregated."""
+        tank = FuelTank.objects.create(name="Test Tank", capacity=5000)
+        FuelEntry.objects.create(tank=tank, amount=1000, supplier="Test")
+
+        tank = FuelTank.objects.get(pk=tank.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(tank.current_level, 1000)
+
+    def test_fuel_tank_current_level_follows_edits_and_deletes(self):
+        """Test current level is adjusted when entries change or are removed."""
+        tank = FuelTank.objects.create(name="Test Tank", capacity=5000)
+        entry = FuelEntry.objects.create(tank=tank, amount=1000, supplier="Test")
+
+        entry.amount = 800
+        entry.save()
+        tank.refresh_from_db()
+        self.assertEqual(tank.current_level, 800)
+
+        entry.delete()
+        tank.refresh_from_db()
+        self.assertEqual(tank.current_level, 0)
+
+    def test_fuel_tank_tracks_open_refill(self):
+        """Test the tank points at its open refill until it is closed."""
+        tank = FuelTank.objects.create(name="Test Tank", capacity=5000)
+        entry = FuelEntry.objects.create(tank=tank, amount=1000, supplier="Test")
+        tank.refresh_from_db()
+        self.assertEqual(tank.open_refill, entry)
+
+        entry.is_closed = True
+        entry.save()
+        tank.refresh_from_db()
+        self.assertIsNone(tank.open_refill)
+
+    def test_closing_refill_keeps_level_without_rereading(self):
+        """Test closing a refill leaves the level alone and skips the before-image read."""
+        tank = FuelTank.objects.create(name="Test Tank", capacity=5000)
+        entry = FuelEntry.objects.create(tank=tank, amount=1000, supplier="Test")
+
+        entry.is_closed = True
+        # UPDATE the entry + clear the tank's open_refill pointer
+        with self.assertNumQueries(2):
+            entry.save(update_fields=["is_closed"])
+        tank.refresh_from_db()
+        self.assertEqual(tank.current_level, 1000)
+
+    def test_bulk_register_updates_tank(self):
+        """Test bulk-registered refills update the tank level and open refill."""
+        tank = FuelTank.objects.create(name="Test Tank", capacity=5000)
+        entries = FuelEntry.bulk_register([
+            {"tank": tank, "amount": 300, "supplier": "Old", "is_closed": True},
+            {"tank": tank, "amount": 200, "supplier": "New"},
+        ])
+
+        tank.refresh_from_db()
+        self.assertEqual(tank.current_level, 500)
+        self.assertEqual(tank.open_refill, entries[1])
+
+    def test_fuel_tank_save_keeps_current_level(self):
+        """Test saving a stale tank instance does not overwrite its level."""
+        tank = FuelTank.objects.create(name="Test Tank", capacity=5000)
+        stale = FuelTank.objects.get(pk=tank.pk)
+        FuelEntry.objects.create(tank=tank, amount=1000, supplier="Test")
+
+        stale.name = "Renamed"
+        stale.save()
+        tank.refresh_from_db()
+        self.assertEqual(tank.current_level, 1000)
+
 
 class FuelEntryModelTest(TestCase):
     """Tests for the FuelEntry model."""
@@ -145,6 +221,13 @@ class FuelEntryModelTest(TestCase):
         self.assertEqual(entry.used_amount, 300)
         self.assertEqual(entry.remaining_amount, 700)
 
+        entry = FuelEntry.objects.annotate(
+            used_total=Coalesce(Sum("usages__amount"), Value(0))
+        ).get(pk=entry.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(entry.used_amount, 300)
+            self.assertEqual(entry.remaining_amount, 700)
+
 
 class FuelUsageModelTest(TestCase):
     """Tests for the FuelUsage model."""
@@ -235,6 +318,118 @@ class FuelViewTest(TestCase):
         response = self.client.get(reverse("fuel:fuel-home"))
         self.assertEqual(response.status_code, 200)
 
+    def test_fuel_home_usage_rows_do_not_query(self):
+        """Test the usage table loads vehicle and operator with the rows."""
+        vehicle = Vehicle.objects.create(plate="ABC-123")
+        entry = FuelEntry.objects.create(tank=self.tank, amount=1000, supplier="Test")
+
+        def add_usage():
+            FuelUsage.objects.create(
+                tank=self.tank, amount=10, vehicle=vehicle,
+                operator=self.staff_employee, refill=entry
+            )
+
+        self.client.login(username="staffuser", password="testpass123")
+        add_usage()
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(reverse("fuel:fuel-home"))
+        add_usage()
+        add_usage()
+        with self.assertNumQueries(len(one_row)):
+            self.client.get(reverse("fuel:fuel-home"))
+
+    def test_add_entry_reports_concurrent_open_refill(self):
+        """Test a second open refill slipping past validation shows a form error."""
+        FuelEntry.objects.create(tank=self.tank, amount=1000, supplier="First")
+        self.client.login(username="staffuser", password="testpass123")
+
+        # Simulate a concurrent request: validation ran before the first insert
+        with mock.patch.object(FuelEntry, "validate_constraints"):
+            response = self.client.post(reverse("fuel:fuel-add-entry"), {
+                "tank": self.tank.pk,
+                "date": "2026-01-02",
+                "amount": 500,
+                "supplier": "Second",
+            })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["form"].non_field_errors())
+        self.assertEqual(FuelEntry.objects.count(), 1)
+
+    def test_vehicle_usage_sidebar_lists_vehicles(self):
+        """Test the vehicle sidebar lists every vehicle."""
+        self.client.login(username="staffuser", password="testpass123")
+        Vehicle.objects.create(plate="AA111BB")
+        Vehicle.objects.create(plate="CC222DD", is_active=False)
+        response = self.client.get(reverse("fuel:vehicle-usage"))
+        self.assertContains(response, "AA111BB")
+        self.assertContains(response, "CC222DD")
+
+    def test_vehicle_usage_groups_by_refill(self):
+        """Test vehicle usage groups rows under their refill with per-refill totals."""
+        vehicle = Vehicle.objects.create(plate="ABC-123")
+        old = FuelEntry.objects.create(
+            tank=self.tank, amount=1000, supplier="Old", date="2026-01-01", is_closed=True
+        )
+        new = FuelEntry.objects.create(tank=self.tank, amount=500, supplier="New", date="2026-02-01")
+        for refill, amount in ((old, 100), (old, 50), (new, 30)):
+            FuelUsage.objects.create(
+                tank=self.tank, amount=amount, vehicle=vehicle,
+                operator=self.staff_employee, refill=refill
+            )
+
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(reverse("fuel:vehicle-usage") + f"?vehicle={vehicle.pk}")
+        groups = response.context["usage_groups"]
+        self.assertEqual(list(groups), [new, old])
+        self.assertEqual(groups[old]["total"], 150)
+        self.assertEqual(len(groups[new]["usages"]), 1)
+
+    def test_close_refill_books_leftover_on_system_records(self):
+        """Test closing a refill empties the tank onto SYSTEM / DIFERENCE."""
+        Vehicle.objects.create(plate="ABC-123")
+        system_vehicle = Vehicle.objects.create(plate="DIFERENCE")
+        system_operator = Employee.objects.create(name="SYSTEM")
+        entry = FuelEntry.objects.create(tank=self.tank, amount=1000, supplier="Test")
+
+        self.client.login(username="staffuser", password="testpass123")
+        self.client.post(reverse("fuel:fuel-entry-close", args=[entry.pk]))
+
+        leftover = FuelUsage.objects.get(refill=entry)
+        self.assertEqual(leftover.amount, 1000)
+        self.assertEqual(leftover.vehicle, system_vehicle)
+        self.assertEqual(leftover.operator, system_operator)
+        self.tank.refresh_from_db()
+        self.assertEqual(self.tank.current_level, 0)
+        self.assertIsNone(self.tank.open_refill)
+
+    def test_existing_refill_dates_are_distinct(self):
+        """Test refill dates endpoint returns each date once as ISO strings."""
+        FuelEntry.objects.bulk_create([
+            FuelEntry(tank=self.tank, amount=100, supplier="Test", date="2026-01-01", is_closed=True)
+            for _ in range(2)
+        ])
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(reverse("fuel:existing-refill-dates", args=[self.tank.pk]))
+        self.assertEqual(response.json(), {"dates": ["2026-01-01"]})
+
+    def test_fuel_entry_detail_vehicle_report(self):
+        """Test refill detail totals usage per vehicle."""
+        car = Vehicle.objects.create(plate="ABC-123")
+        van = Vehicle.objects.create(plate="XYZ-789")
+        entry = FuelEntry.objects.create(tank=self.tank, amount=1000, supplier="Test")
+        for vehicle, amount in ((car, 100), (van, 40), (car, 60)):
+            FuelUsage.objects.create(
+                tank=self.tank, amount=amount, vehicle=vehicle,
+                operator=self.staff_employee, refill=entry
+            )
+
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(reverse("fuel:fuel-entry-detail", args=[entry.pk]))
+        report = dict(response.context["vehicle_report"])
+        self.assertEqual(report[car], {"total": 160, "count": 2})
+        self.assertEqual(report[van], {"total": 40, "count": 1})
+
     def test_fuel_entries_list_view(self):
         """Test fuel entries list view."""
         FuelEntry.objects.create(
@@ -246,6 +441,19 @@ class FuelViewTest(TestCase):
         response = self.client.get(reverse("fuel:fuel-entries"))
         self.assertEqual(response.status_code, 200)
 
+    def test_fuel_entries_list_paginates(self):
+        """Test fuel entries list shows one page of entries at a time."""
+        FuelEntry.objects.bulk_create([
+            FuelEntry(tank=self.tank, amount=100, supplier="Test", is_closed=True)
+            for _ in range(ENTRIES_PER_PAGE + 1)
+        ])
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(reverse("fuel:fuel-entries"))
+        self.assertEqual(len(response.context["entries"]), ENTRIES_PER_PAGE)
+
+        response = self.client.get(reverse("fuel:fuel-entries") + "?page=2")
+        self.assertEqual(len(response.context["entries"]), 1)
+
 
 class FuelUsageFormTest(TestCase):
     """Tests for fuel usage form validation."""
@@ -292,6 +500,14 @@ class FuelUsageFormTest(TestCase):
         form = FuelUsageForm(data=form_data)
         self.assertFalse(form.is_valid())
 
+    def test_default_tank_initial(self):
+        """Test the forms default to the first tank, if there is one."""
+        self.assertEqual(FuelUsageForm().fields["tank"].initial, self.tank.pk)
+        self.assertEqual(FuelEntryForm().fields["tank"].initial, self.tank.pk)
+
+        self.tank.delete()
+        self.assertIsNone(FuelUsageForm().fields["tank"].initial)
+
 
 class TankLevelCalculationTest(TransactionTestCase):
     """Tests for tank level calculations."""
@@ -1,35 +1,29 @@
-from collections import defaultdict, OrderedDict
+from collections import OrderedDict
+from itertools import groupby
+from operator import attrgetter
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.cache import never_cache
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import Sum, Prefetch
+from django.db import IntegrityError, transaction
 
-from audit.utils import log_action
-from audit.middleware import get_client_ip
+from audit.models import AuditLog
+from audit.utils import get_client_ip, log_action
 from management.permissions import staff_required
 
-from .models import FuelTank, FuelUsage, FuelEntry
-from core.models import Vehicle, Employee
+from .models import FuelTank, FuelUsage, FuelEntry, teprica_operator_id, teprica_vehicle_id
+from core.models import Vehicle
 from .forms import FuelEntryForm, FuelUsageForm
 
+ENTRIES_PER_PAGE = 50
+
 
 @staff_required
 def fuel_home(request):
-    # Prefetch open refills in a single query
-    open_refills_prefetch = Prefetch(
-        "entries",
-        queryset=FuelEntry.objects.filter(is_closed=False).order_by("-date", "-id"),
-        to_attr="open_refills"
-    )
-    tanks = FuelTank.objects.prefetch_related(open_refills_prefetch).all()
-    usages = FuelUsage.objects.order_by("-date")
-
-    # Attach open_refill from prefetched data
-    for tank in tanks:
-        tank.open_refill = tank.open_refills[0] if tank.open_refills else None
+    tanks = FuelTank.objects.select_related("open_refill")
+    usages = FuelUsage.objects.select_related("vehicle", "operator").order_by("-date", "-id")
 
     return render(request, "fuel/fuel-home.html", {
         "tanks": tanks,
@@ -43,11 +37,21 @@ def add_entry(request):
     form = FuelEntryForm(request.POST or None)
 
     if request.method == "POST" and form.is_valid():
-        entry = form.save()
+        try:
+            # The partial unique index is the real guard against a second
+            # OPEN refill; a concurrent request can slip past form validation
+            with transaction.atomic():
+                entry = form.save()
+        except IntegrityError:
+            form.add_error(None, "Ka tashmë një furnizim të hapur (OPEN) për këtë depo.")
+            return render(request, "fuel/form.html", {
+                "form": form,
+                "page_title": "Furnizim i Depozitës"
+            })
 
         log_action(
             user=request.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="FuelEntry",
             object_id=str(entry.pk),
             description=(
@@ -67,9 +71,12 @@ def add_entry(request):
 
 @staff_required
 def existing_refill_dates(request, tank_id):
+    # order_by() drops Meta.ordering's id so DISTINCT applies to the date alone
     dates = list(
-        FuelEntry.objects.filter(
-            tank_id=tank_id).values_list("date", flat=True)
+        FuelEntry.objects.filter(tank_id=tank_id)
+        .order_by()
+        .values_list("date", flat=True)
+        .distinct()
     )
     return JsonResponse({"dates": dates})
 
@@ -83,14 +90,13 @@ def add_usage(request):
     if request.method == "POST" and form.is_valid():
         usage = form.save(commit=False)
 
-        # Lock the tank's entries to prevent race conditions
-        open_refill = (
-            FuelEntry.objects
-            .select_for_update()
-            .filter(tank=usage.tank, is_closed=False)
-            .order_by("-date", "-id")
-            .first()
+        # Lock the tank row (and its open refill) to prevent race conditions
+        tank = (
+            FuelTank.objects.select_for_update()
+            .select_related("open_refill")
+            .get(pk=usage.tank_id)
         )
+        open_refill = tank.open_refill
 
         if not open_refill:
             return render(request, "fuel/form.html", {
@@ -100,11 +106,7 @@ def add_usage(request):
             })
 
         # Re-check tank level inside transaction to prevent overdraw race condition
-        entries_total = FuelEntry.objects.filter(tank=usage.tank).aggregate(
-            total=Sum("amount"))["total"] or 0
-        usage_total = FuelUsage.objects.filter(tank=usage.tank).aggregate(
-            total=Sum("amount"))["total"] or 0
-        tank_level = entries_total - usage_total
+        tank_level = tank.current_level
         projected_level = tank_level - usage.amount
 
         if projected_level < -FuelUsageForm.MAX_NEGATIVE_LITERS:
@@ -119,7 +121,7 @@ def add_usage(request):
 
         log_action(
             user=request.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="FuelUsage",
             object_id=str(usage.pk),
             description=(
@@ -140,38 +142,32 @@ def add_usage(request):
 @staff_required
 @transaction.atomic
 def close_refill(request, id):
-    entry = get_object_or_404(FuelEntry.objects.select_for_update(), id=id)
+    entry = get_object_or_404(FuelEntry, id=id)
 
     if request.method != "POST":
         return redirect("fuel:fuel-home")
 
+    # The tank row is the single lock for its refills and usages; re-read
+    # is_closed under it so two concurrent closes can't both get past here
+    tank = FuelTank.objects.select_for_update().get(pk=entry.tank_id)
+    entry.refresh_from_db(fields=["is_closed"])
+
     if entry.is_closed:
         return redirect("fuel:fuel-home")
 
-    tank = entry.tank
-
     # ✅ Make tank go to 0 => consume all current_level as "Teprica"
-    entries = FuelEntry.objects.filter(tank=tank).aggregate(total=Sum("amount"))["total"] or 0
-    usage = FuelUsage.objects.filter(tank=tank).aggregate(total=Sum("amount"))["total"] or 0
-    teprica_amount = entries - usage
+    teprica_amount = tank.current_level
 
     if teprica_amount != 0:
-        # ✅ operator: try SYSTEM first, else fallback to first employee
-        operator = Employee.objects.filter(name__iexact="SYSTEM").first()
-        if operator is None:
-            operator = Employee.objects.order_by("id").first()
-
-        # ✅ vehicle: try TEPRICA plate first, else fallback to first vehicle
-        teprica_vehicle = Vehicle.objects.filter(
-            plate__iexact="DIFERENCE").first()
-        if teprica_vehicle is None:
-            teprica_vehicle = Vehicle.objects.order_by("id").first()
+        # ✅ operator: SYSTEM, else first employee; vehicle: DIFERENCE, else first vehicle
+        operator_id = teprica_operator_id()
+        vehicle_id = teprica_vehicle_id()
 
         # If you have NO employees or vehicles, stop with a friendly error
-        if operator is None:
+        if operator_id is None:
             messages.error(request, "Nuk mund të mbyllet furnizimi: mungon punonjësi 'SYSTEM'.")
             return redirect("fuel:fuel-home")
-        if teprica_vehicle is None:
+        if vehicle_id is None:
             messages.error(request, "Nuk mund të mbyllet furnizimi: mungon mjeti 'DIFERENCE'.")
             return redirect("fuel:fuel-home")
 
@@ -179,10 +175,10 @@ def close_refill(request, id):
             tank=tank,
             date=timezone.now().date(),
             amount=teprica_amount,        # ✅ may be negative
-            vehicle=teprica_vehicle,
+            vehicle_id=vehicle_id,
             refill=entry,
             project = "Teprice" if teprica_amount < 0 else "Mungese",
-            operator=operator,
+            operator_id=operator_id,
         )
 
     # ✅ Close refill
@@ -192,7 +188,7 @@ def close_refill(request, id):
 
     log_action(
         user=request.user,
-        action="UPDATE",
+        action=AuditLog.Action.UPDATE,
         model="FuelEntry",
         object_id=str(entry.pk),
         description=(
@@ -207,7 +203,7 @@ def close_refill(request, id):
 
 @staff_required
 def vehicle_usage(request):
-    vehicles = Vehicle.objects.order_by("-is_active", "plate")
+    vehicles = Vehicle.objects.order_by("-is_active", "plate").values("id", "plate", "is_active")
     selected_vehicle = request.GET.get("vehicle")
 
     usage_groups = OrderedDict()
@@ -224,23 +220,15 @@ def vehicle_usage(request):
             .order_by("-refill__date", "-refill__id", "-date", "-id")
         )
 
-        for u in usages:
-            refill = u.refill  # FuelEntry or None
-
+        # Rows arrive ordered by refill, so each refill's usages are one run
+        for refill_id, rows in groupby(usages, key=attrgetter("refill_id")):
+            rows = list(rows)
             # Optional: group old rows that have no refill
-            if refill is None:
-                key = "NO_REFILL"
-                if key not in usage_groups:
-                    usage_groups[key] = {"usages": [], "total": 0}
-                usage_groups[key]["usages"].append(u)
-                usage_groups[key]["total"] += u.amount
-                continue
-
-            if refill not in usage_groups:
-                usage_groups[refill] = {"usages": [], "total": 0}
-
-            usage_groups[refill]["usages"].append(u)
-            usage_groups[refill]["total"] += u.amount
+            key = rows[0].refill if refill_id is not None else "NO_REFILL"
+            usage_groups[key] = {
+                "usages": rows,
+                "total": sum(u.amount for u in rows),
+            }
 
     return render(request, "fuel/vehicle_usage.html", {
         "vehicles": vehicles,
@@ -252,8 +240,16 @@ def vehicle_usage(request):
 
 @staff_required
 def fuel_entries_list(request):
-    entries = FuelEntry.objects.select_related("tank").order_by("-date", "-id")
-    return render(request, "fuel/fuel_entries_list.html", {"entries": entries})
+    entries = (
+        FuelEntry.objects.select_related("tank")
+        .only("id", "date", "amount", "supplier", "tank__name")
+        .order_by("-date", "-id")
+    )
+    page_obj = Paginator(entries, ENTRIES_PER_PAGE).get_page(request.GET.get("page"))
+    return render(request, "fuel/fuel_entries_list.html", {
+        "entries": page_obj,
+        "page_obj": page_obj,
+    })
 
 
 @staff_required
@@ -261,14 +257,18 @@ def fuel_entry_detail(request, id):
     entry = get_object_or_404(FuelEntry, id=id)
 
     usages = FuelUsage.objects.filter(refill=entry).select_related(
-        "vehicle").order_by("-date", "-id")
+        "vehicle", "operator").order_by("-date", "-id")
 
-    vehicle_report = defaultdict(lambda: {"total": 0, "count": 0})
+    # Keyed by vehicle_id (int) rather than hashing a Vehicle instance per row
+    vehicle_report = {}
     for u in usages:
-        vehicle_report[u.vehicle]["total"] += u.amount
-        vehicle_report[u.vehicle]["count"] += 1
+        report = vehicle_report.get(u.vehicle_id)
+        if report is None:
+            report = vehicle_report[u.vehicle_id] = (u.vehicle, {"total": 0, "count": 0})
+        report[1]["total"] += u.amount
+        report[1]["count"] += 1
 
-    vehicle_report_list = list(vehicle_report.items())
+    vehicle_report_list = list(vehicle_report.values())
 
     return render(request, "fuel/fuel_entry_detail.html", {
         "entry": entry,
@@ -2,6 +2,8 @@ from django import forms
 from .models import Product, Depot, WithdrawalHeader, WithdrawalItem, ReturnHeader, ReturnItem
 from django.forms import inlineformset_factory
 from django.core.exceptions import ValidationError
+from django.db.models import F, Sum
+from django.db.models.functions import Coalesce
 from core.models import Employee
 
 
@@ -49,29 +51,6 @@ class ProductForm(forms.ModelForm):
             "price": "Çmimi"
         }
 
-    def clean(self):
-        cleaned = super().clean()
-        depot = cleaned.get("depot")
-        name = cleaned.get("name")
-
-        if depot and name:
-            qs = Product.objects.filter(depot=depot, name__iexact=name)
-
-            # allow editing the same product without triggering duplicate
-            if self.instance.pk:
-                qs = qs.exclude(pk=self.instance.pk)
-
-            if qs.exists():
-                # show message under the "name" field
-                self.add_error(
-                    "name",
-                    "Ky produkt ekziston tashmë në këtë magazinë."
-                )
-
-        return cleaned
-
-
-
 
 class AddQuantityForm(forms.Form):
     quantity = forms.IntegerField(
@@ -184,9 +163,14 @@ class ReturnItemForm(forms.ModelForm):
         employee = kwargs.pop("employee", None)
         super().__init__(*args, **kwargs)
 
-        # Only returnable items held by this employee
+        # Only returnable items this employee still holds; the option label
+        # (WithdrawalItem.__str__) needs just product.name and quantity
         if employee:
-            self.fields["withdrawal_item"].queryset = WithdrawalItem.objects.filter(
-                header__employee=employee,
-                product__item_type="returnable"
-            ).select_related("product")
+            self.fields["withdrawal_item"].queryset = (
+                WithdrawalItem.objects
+                .filter(header__employee=employee, product__item_type="returnable")
+                .select_related("product")
+                .only("id", "quantity", "product__name")
+                .annotate(returned_sum=Coalesce(Sum("returnitem__quantity"), 0))
+                .filter(quantity__gt=F("returned_sum"))
+            )
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:44
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_names(apps, schema_editor):
+    """
+    Stop before the index is built if a depot holds names that differ only
+    in case. Which row to keep is a stock decision, so merge or rename the
+    listed products by hand, then run the migration again.
+    """
+    Product = apps.get_model("inventory", "Product")
+    duplicates = list(
+        Product.objects.values("depot_id", lower_name=Lower("name"))
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("depot_id", "lower_name")[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Product names must be unique per depot ignoring case before "
+            f"inventory.0006 can add its constraint: (depot_id, name) {duplicates}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_alter_depot_description_alter_product_description_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_names, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='product',
+            name='unique_product_name_per_depot',
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(models.F('depot'), django.db.models.functions.text.Lower('name'), name='unique_product_name_per_depot_ci', violation_error_code='product_name_taken', violation_error_message='Ky produkt ekziston tashmë në këtë magazinë.'),
+        ),
+    ]
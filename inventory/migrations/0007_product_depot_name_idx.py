@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_product_name_unique_ci'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['depot', 'name'], name='product_depot_name_idx'),
+        ),
+    ]
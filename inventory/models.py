@@ -1,11 +1,27 @@
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 from django.db import models
 from django.utils import timezone
 from django.db.models import Sum
+from django.db.models.functions import Lower
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
 # Create your models here.
 
+PRODUCT_NAME_TAKEN = "Ky produkt ekziston tashmë në këtë magazinë."
+PRODUCT_NAME_TAKEN_CODE = "product_name_taken"
+
+
+def active_products():
+    """Products of active depots, by name, with only the columns the picker shows."""
+    # Not cached: the picker shows live stock, which changes on every withdrawal
+    return (
+        Product.objects.select_related("depot")
+        .filter(depot__is_active=True)
+        .only("id", "name", "quantity", "unit", "depot__name")
+        .order_by("name")
+    )
+
 
 class Depot(models.Model):
     name = models.CharField(max_length=200, unique=True)
@@ -62,9 +78,33 @@ class Product(models.Model):
 
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=["depot", "name"], name="unique_product_name_per_depot")
+            # Case-insensitive: "Hammer" and "hammer" are the same product in a depot
+            models.UniqueConstraint(
+                "depot",
+                Lower("name"),
+                name="unique_product_name_per_depot_ci",
+                violation_error_message=PRODUCT_NAME_TAKEN,
+                violation_error_code=PRODUCT_NAME_TAKEN_CODE,
+            )
         ]
-        
+        indexes = [
+            # depot_detail: one depot's products in name order, no sort step
+            # (the Lower(name) index above can't serve ORDER BY name)
+            models.Index(fields=["depot", "name"], name="product_depot_name_idx"),
+        ]
+
+    def validate_constraints(self, exclude=None):
+        try:
+            super().validate_constraints(exclude=exclude)
+        except ValidationError as e:
+            # Lower("name") leaves the unique constraint without a field of
+            # its own; report the duplicate under name, where the form shows it
+            errors = e.update_error_dict({})
+            for error in errors.pop(NON_FIELD_ERRORS, []):
+                key = "name" if error.code == PRODUCT_NAME_TAKEN_CODE else NON_FIELD_ERRORS
+                errors.setdefault(key, []).append(error)
+            raise ValidationError(errors)
+
     def __str__(self):
         unit_display = "" if self.unit == "pcs" else f" {self.unit}"
         return f"{self.name} ({self.quantity}{unit_display})"
@@ -89,6 +129,9 @@ class WithdrawalItem(models.Model):
 
     @property
     def returned_qty(self):
+        # Listings annotate returned_sum=Coalesce(Sum("returnitem__quantity"), 0)
+        if hasattr(self, "returned_sum"):
+            return self.returned_sum
         total = ReturnItem.objects.filter(withdrawal_item=self).aggregate(
             total=Sum("quantity")
         )["total"]
@@ -1,15 +1,19 @@
 """
 Tests for the Inventory app - Products, Withdrawals, Returns.
 """
-from django.test import TestCase, Client, TransactionTestCase
+from django.test import TestCase, Client
 from django.contrib.auth.models import User, Group
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from audit.models import AuditLog
 from core.models import Employee
 from inventory.models import (
     Depot, Product, WithdrawalHeader, WithdrawalItem,
-    ReturnHeader, ReturnItem
+    ReturnHeader, ReturnItem, PRODUCT_NAME_TAKEN
 )
-from inventory.forms import ProductForm, AddQuantityForm
+from inventory.forms import ProductForm, AddQuantityForm, ReturnItemForm
+from inventory.views import PRODUCTS_PER_PAGE
 
 
 class DepotModelTest(TestCase):
@@ -39,8 +43,9 @@ class DepotModelTest(TestCase):
 class ProductModelTest(TestCase):
     """Tests for the Product model."""
 
-    def setUp(self):
-        self.depot = Depot.objects.create(name="Test Depot")
+    @classmethod
+    def setUpTestData(cls):
+        cls.depot = Depot.objects.create(name="Test Depot")
 
     def test_create_product(self):
         """Test creating a product."""
@@ -126,18 +131,19 @@ class ProductModelTest(TestCase):
 class WithdrawalModelTest(TestCase):
     """Tests for Withdrawal models."""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username="testuser",
             password="testpass123"
         )
-        self.employee = Employee.objects.create(
-            user=self.user,
+        cls.employee = Employee.objects.create(
+            user=cls.user,
             name="Test Employee"
         )
-        self.depot = Depot.objects.create(name="Test Depot")
-        self.product = Product.objects.create(
-            depot=self.depot,
+        cls.depot = Depot.objects.create(name="Test Depot")
+        cls.product = Product.objects.create(
+            depot=cls.depot,
             name="Test Product",
             quantity=100,
             item_type="returnable"
@@ -190,29 +196,30 @@ class WithdrawalModelTest(TestCase):
 class ReturnModelTest(TestCase):
     """Tests for Return models."""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username="testuser",
             password="testpass123"
         )
-        self.employee = Employee.objects.create(
-            user=self.user,
+        cls.employee = Employee.objects.create(
+            user=cls.user,
             name="Test Employee"
         )
-        self.depot = Depot.objects.create(name="Test Depot")
-        self.product = Product.objects.create(
-            depot=self.depot,
+        cls.depot = Depot.objects.create(name="Test Depot")
+        cls.product = Product.objects.create(
+            depot=cls.depot,
             name="Test Product",
             quantity=100,
             item_type="returnable"
         )
         # Create withdrawal first
-        self.withdrawal_header = WithdrawalHeader.objects.create(
-            employee=self.employee
+        cls.withdrawal_header = WithdrawalHeader.objects.create(
+            employee=cls.employee
         )
-        self.withdrawal_item = WithdrawalItem.objects.create(
-            header=self.withdrawal_header,
-            product=self.product,
+        cls.withdrawal_item = WithdrawalItem.objects.create(
+            header=cls.withdrawal_header,
+            product=cls.product,
             quantity=10
         )
 
@@ -249,27 +256,69 @@ class ReturnModelTest(TestCase):
 class InventoryViewTest(TestCase):
     """Tests for inventory views."""
 
-    def setUp(self):
-        self.client = Client()
-        self.staff_group, _ = Group.objects.get_or_create(name="staff")
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff_group, _ = Group.objects.get_or_create(name="staff")
 
-        self.staff_user = User.objects.create_user(
+        cls.staff_user = User.objects.create_user(
             username="staffuser",
             password="testpass123"
         )
-        self.staff_user.groups.add(self.staff_group)
-        self.staff_employee = Employee.objects.create(
-            user=self.staff_user,
+        cls.staff_user.groups.add(cls.staff_group)
+        cls.staff_employee = Employee.objects.create(
+            user=cls.staff_user,
             name="Staff Employee"
         )
 
-        self.depot = Depot.objects.create(name="Test Depot")
-        self.product = Product.objects.create(
-            depot=self.depot,
+        cls.depot = Depot.objects.create(name="Test Depot")
+        cls.product = Product.objects.create(
+            depot=cls.depot,
             name="Test Product",
             quantity=100
         )
 
+    def setUp(self):
+        self.client = Client()
+
+    def _assert_constant_queries(self, url, grow):
+        """The page's query count must not change after grow() adds rows."""
+        self.client.login(username="staffuser", password="testpass123")
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(url)
+        grow()
+        with self.assertNumQueries(len(baseline)):
+            self.client.get(url)
+
+    def _add_products(self, count=20):
+        Product.objects.bulk_create(
+            Product(depot=self.depot, name=f"Extra {i}", quantity=1, item_type="returnable")
+            for i in range(count)
+        )
+
+    def test_all_products_constant_queries(self):
+        """Test all products runs the same number of queries for 1 or 21 products."""
+        self._assert_constant_queries(reverse("inventory:all-products"), self._add_products)
+
+    def test_depot_detail_constant_queries(self):
+        """Test depot detail runs the same number of queries for 1 or 21 products."""
+        self._assert_constant_queries(
+            reverse("inventory:depot-detail", args=[self.depot.pk]), self._add_products
+        )
+
+    def test_product_detail_constant_queries(self):
+        """Test product detail runs the same number of queries for 1 or 21 withdrawals."""
+        def add_withdrawals():
+            for i in range(20):
+                employee = Employee.objects.create(name=f"Worker {i}")
+                header = WithdrawalHeader.objects.create(employee=employee)
+                WithdrawalItem.objects.create(header=header, product=self.product, quantity=1)
+
+        header = WithdrawalHeader.objects.create(employee=self.staff_employee)
+        WithdrawalItem.objects.create(header=header, product=self.product, quantity=1)
+        self._assert_constant_queries(
+            reverse("inventory:product-detail", args=[self.product.pk]), add_withdrawals
+        )
+
     def test_inventory_home_requires_staff(self):
         """Test inventory home requires staff access."""
         regular_user = User.objects.create_user(
@@ -295,6 +344,25 @@ class InventoryViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Test Product")
 
+    def test_depot_detail_totals_with_several_returns(self):
+        """Test stock totals aren't inflated when one withdrawal has several returns."""
+        self.product.item_type = "returnable"
+        self.product.save()
+        header = WithdrawalHeader.objects.create(employee=self.staff_employee)
+        item = WithdrawalItem.objects.create(header=header, product=self.product, quantity=5)
+        return_header = ReturnHeader.objects.create(employee=self.staff_employee)
+        ReturnItem.objects.create(header=return_header, withdrawal_item=item, quantity=1)
+        ReturnItem.objects.create(header=return_header, withdrawal_item=item, quantity=1)
+
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(
+            reverse("inventory:depot-detail", args=[self.depot.pk])
+        )
+        product = response.context["products"].get(pk=self.product.pk)
+        self.assertEqual(product.withdrawn_sum, 5)
+        self.assertEqual(product.returned_sum, 2)
+        self.assertEqual(product.total_quantity, self.product.quantity + 3)
+
     def test_product_detail_view(self):
         """Test product detail view."""
         self.client.login(username="staffuser", password="testpass123")
@@ -303,6 +371,152 @@ class InventoryViewTest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_product_detail_lists_outstanding_only(self):
+        """Test product detail shows and totals only quantities still out."""
+        self.product.item_type = "returnable"
+        self.product.save()
+        header = WithdrawalHeader.objects.create(employee=self.staff_employee)
+        open_item = WithdrawalItem.objects.create(header=header, product=self.product, quantity=5)
+        done_item = WithdrawalItem.objects.create(header=header, product=self.product, quantity=2)
+        return_header = ReturnHeader.objects.create(employee=self.staff_employee)
+        ReturnItem.objects.create(header=return_header, withdrawal_item=open_item, quantity=1)
+        ReturnItem.objects.create(header=return_header, withdrawal_item=done_item, quantity=2)
+
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(
+            reverse("inventory:product-detail", args=[self.product.pk])
+        )
+        items = response.context["items_display"]
+        self.assertEqual([item["qty"] for item in items], [4])
+        self.assertEqual(items[0]["employee"], "Staff Employee")
+        self.assertEqual(response.context["total_taken"], 4)
+        self.assertEqual(response.context["total_stock"], self.product.quantity + 4)
+
+    def test_employee_returnables_outstanding_only(self):
+        """Test employee view lists only items still out, using the annotated returns."""
+        self.product.item_type = "returnable"
+        self.product.save()
+        header = WithdrawalHeader.objects.create(employee=self.staff_employee)
+        open_item = WithdrawalItem.objects.create(header=header, product=self.product, quantity=5)
+        done_item = WithdrawalItem.objects.create(header=header, product=self.product, quantity=2)
+        return_header = ReturnHeader.objects.create(employee=self.staff_employee)
+        ReturnItem.objects.create(header=return_header, withdrawal_item=open_item, quantity=1)
+        ReturnItem.objects.create(header=return_header, withdrawal_item=done_item, quantity=2)
+
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(
+            reverse("inventory:employee-detail", args=[self.staff_employee.pk])
+        )
+        withdrawals = list(response.context["withdrawals"])
+        self.assertEqual(withdrawals, [open_item])
+        with self.assertNumQueries(0):
+            self.assertEqual(withdrawals[0].outstanding_qty, 4)
+
+    def test_return_item_rejects_more_than_outstanding(self):
+        """Test return form shows the outstanding quantity and refuses to exceed it."""
+        header = WithdrawalHeader.objects.create(employee=self.staff_employee)
+        item = WithdrawalItem.objects.create(header=header, product=self.product, quantity=5)
+        ReturnItem.objects.create(
+            header=ReturnHeader.objects.create(employee=self.staff_employee),
+            withdrawal_item=item,
+            quantity=1,
+        )
+
+        self.client.login(username="staffuser", password="testpass123")
+        url = reverse("inventory:return-item", args=[item.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.context["withdrawal_item"].outstanding_qty, 4)
+
+        response = self.client.post(url, {"quantity": 5})
+        self.assertContains(response, "Max: 4")
+        self.assertEqual(ReturnItem.objects.filter(withdrawal_item=item).count(), 1)
+
+    def _withdrawal_post(self, *quantities):
+        data = {
+            "employee": self.staff_employee.pk,
+            "date": "2026-01-15",
+            "notes": "",
+            "form-TOTAL_FORMS": len(quantities),
+            "form-INITIAL_FORMS": 0,
+        }
+        for i, qty in enumerate(quantities):
+            data[f"form-{i}-product"] = self.product.pk
+            data[f"form-{i}-quantity"] = qty
+        return self.client.post(reverse("inventory:create-withdrawal"), data)
+
+    def test_create_withdrawal_takes_stock_per_product(self):
+        """Test a slip listing one product twice withdraws the combined quantity."""
+        self.client.login(username="staffuser", password="testpass123")
+        response = self._withdrawal_post(30, 20)
+        self.assertRedirects(response, reverse("inventory:inventory-home"))
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 50)
+        self.assertEqual(
+            sorted(WithdrawalItem.objects.values_list("quantity", flat=True)), [20, 30]
+        )
+
+    def test_create_withdrawal_rejects_combined_overdraw(self):
+        """Test rows that each fit but together exceed stock save nothing."""
+        self.client.login(username="staffuser", password="testpass123")
+        response = self._withdrawal_post(60, 60)
+        self.assertContains(response, "Not enough stock for Test Product. Available: 100")
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 100)
+        self.assertFalse(WithdrawalHeader.objects.exists())
+
+    def test_add_quantity_increments_stock(self):
+        """Test adding quantity updates stock in place and logs the new level."""
+        self.client.login(username="staffuser", password="testpass123")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("inventory:add-quantity", args=[self.product.pk]), {"quantity": 25}
+            )
+        self.assertRedirects(response, reverse("inventory:product-detail", args=[self.product.pk]))
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 125)
+        self.assertTrue(AuditLog.objects.filter(description__contains="new stock: 125").exists())
+
+    def test_return_item_puts_stock_back(self):
+        """Test a return adds its quantity back to the product's stock."""
+        header = WithdrawalHeader.objects.create(employee=self.staff_employee)
+        item = WithdrawalItem.objects.create(header=header, product=self.product, quantity=5)
+
+        self.client.login(username="staffuser", password="testpass123")
+        self.client.post(reverse("inventory:return-item", args=[item.pk]), {"quantity": 3})
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 103)
+        self.assertEqual(item.outstanding_qty, 2)
+
+    def test_withdrawal_form_shows_live_stock(self):
+        """Test the withdrawal form's product list reflects stock changes."""
+        self.client.login(username="staffuser", password="testpass123")
+        url = reverse("inventory:create-withdrawal")
+        self.client.get(url)
+
+        self.product.quantity = 42
+        self.product.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'data-stock="42"')
+
+    def test_my_returnables_lists_own_outstanding_items(self):
+        """Test my returnables shows the user's items still out, or redirects without an employee."""
+        header = WithdrawalHeader.objects.create(employee=self.staff_employee)
+        WithdrawalItem.objects.create(header=header, product=self.product, quantity=5)
+
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(reverse("inventory:my-returnables"))
+        self.assertEqual(response.context["selected_employee"], self.staff_employee)
+        self.assertEqual([w.outstanding_calc for w in response.context["withdrawals"]], [5])
+
+        User.objects.create_user(username="nobody", password="testpass123")
+        self.client.login(username="nobody", password="testpass123")
+        response = self.client.get(reverse("inventory:my-returnables"))
+        self.assertRedirects(response, reverse("core:home"), fetch_redirect_response=False)
+
     def test_all_products_view(self):
         """Test all products view."""
         self.client.login(username="staffuser", password="testpass123")
@@ -310,6 +524,20 @@ class InventoryViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Test Product")
 
+    def test_all_products_paginates(self):
+        """Test all products view renders one page at a time, keeping the sort."""
+        Product.objects.bulk_create(
+            Product(depot=self.depot, name=f"Item {i:03}", quantity=1, unit="pcs")
+            for i in range(PRODUCTS_PER_PAGE)
+        )
+        self.client.login(username="staffuser", password="testpass123")
+        response = self.client.get(reverse("inventory:all-products") + "?sort=name_desc")
+        self.assertEqual(len(response.context["products"]), PRODUCTS_PER_PAGE)
+        self.assertContains(response, "?sort=name_desc&amp;page=2")
+
+        response = self.client.get(reverse("inventory:all-products") + "?sort=name_desc&page=2")
+        self.assertEqual([p.name for p in response.context["products"]], ["Item 000"])
+
     def test_all_products_search(self):
         """Test product search functionality."""
         Product.objects.create(
@@ -327,24 +555,25 @@ class InventoryViewTest(TestCase):
         self.assertContains(response, "Hammer")
 
 
-class StockManagementTest(TransactionTestCase):
+class StockManagementTest(TestCase):
     """Tests for stock management business logic."""
 
-    def setUp(self):
-        self.staff_group, _ = Group.objects.get_or_create(name="staff")
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff_group, _ = Group.objects.get_or_create(name="staff")
+        cls.user = User.objects.create_user(
             username="staffuser",
             password="testpass123"
         )
-        self.user.groups.add(self.staff_group)
-        self.employee = Employee.objects.create(
-            user=self.user,
+        cls.user.groups.add(cls.staff_group)
+        cls.employee = Employee.objects.create(
+            user=cls.user,
             name="Test Employee",
             is_active=True
         )
-        self.depot = Depot.objects.create(name="Test Depot")
-        self.product = Product.objects.create(
-            depot=self.depot,
+        cls.depot = Depot.objects.create(name="Test Depot")
+        cls.product = Product.objects.create(
+            depot=cls.depot,
             name="Test Product",
             quantity=100,
             item_type="returnable"
@@ -443,3 +672,55 @@ class AddQuantityFormTest(TestCase):
         """Test negative quantity is invalid."""
         form = AddQuantityForm(data={"quantity": -10})
         self.assertFalse(form.is_valid())
+
+
+class ProductFormTest(TestCase):
+    """Tests for product form validation."""
+
+    def setUp(self):
+        self.depot = Depot.objects.create(name="Test Depot")
+        Product.objects.create(
+            depot=self.depot,
+            name="Hammer",
+            quantity=5,
+            unit="pcs",
+            item_type="consumable"
+        )
+
+    def test_duplicate_name_differing_in_case_invalid(self):
+        """Test a product name already in the depot is rejected regardless of case."""
+        form = ProductForm(data={
+            "depot": self.depot.pk,
+            "name": "hammer",
+            "date": "2026-01-01",
+            "item_type": "consumable",
+            "quantity": 1,
+            "unit": "pcs",
+            "price": 0,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["name"], [PRODUCT_NAME_TAKEN])
+        self.assertFalse(form.non_field_errors())
+
+
+class ReturnItemFormTest(TestCase):
+    """Tests for return item form."""
+
+    def test_choices_only_items_still_out(self):
+        """Test the withdrawal item choices skip fully returned items."""
+        employee = Employee.objects.create(name="Test Employee")
+        depot = Depot.objects.create(name="Test Depot")
+        product = Product.objects.create(
+            depot=depot, name="Drill", quantity=5, unit="pcs", item_type="returnable"
+        )
+        header = WithdrawalHeader.objects.create(employee=employee)
+        open_item = WithdrawalItem.objects.create(header=header, product=product, quantity=2)
+        done_item = WithdrawalItem.objects.create(header=header, product=product, quantity=1)
+        ReturnItem.objects.create(
+            header=ReturnHeader.objects.create(employee=employee),
+            withdrawal_item=done_item,
+            quantity=1
+        )
+
+        form = ReturnItemForm(employee=employee)
+        self.assertEqual(list(form.fields["withdrawal_item"].queryset), [open_item])
@@ -1,17 +1,20 @@
+from collections import defaultdict
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
 from django.forms import modelformset_factory
-from django.db import transaction
-from django.db.models import Sum, Q, F, IntegerField, Case, When
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Q, F, IntegerField, Case, When, OuterRef, Subquery
 from django.db.models.functions import Coalesce
 from django.views.decorators.cache import never_cache
 
-from audit.utils import log_action
-from audit.middleware import get_client_ip
+from audit.models import AuditLog
+from audit.utils import get_client_ip, log_action
 from management.permissions import staff_required, admin_required
 
 from core.models import Employee
-from .models import Depot, Product, WithdrawalHeader, WithdrawalItem, ReturnItem, ReturnHeader
+from .models import PRODUCT_NAME_TAKEN, active_products, Depot, Product, WithdrawalHeader, WithdrawalItem, ReturnItem, ReturnHeader
 from .forms import (
     ProductForm,
     DepotForm,
@@ -24,23 +27,52 @@ from .forms import (
 )
 
 
+PRODUCTS_PER_PAGE = 100
+
+# all_products ?sort= values -> order_by
+PRODUCT_SORTS = {
+    "name": "name",
+    "name_desc": "-name",
+    "qty": "quantity",
+    "qty_desc": "-quantity",
+    "depot": "depot__name",
+    "depot_desc": "-depot__name",
+}
+
+
 @staff_required
 def inventory_home(request):
     depots = Depot.objects.all()
     return render(request, "inventory/home.html", {"depots": depots})
 
 
-@staff_required
-def depot_detail(request, depot_id):
-    depot = get_object_or_404(Depot, id=depot_id)
-    search = request.GET.get("q", "")
-
-    products = (
-        Product.objects
-        .filter(depot=depot)
+def _with_stock_totals(products):
+    """
+    Annotate withdrawn_sum / returned_sum / outstanding / total_quantity.
+    Each Sum is its own correlated subquery: chaining both reverse joins in
+    one query repeats every withdrawal once per return and inflates withdrawn_sum.
+    """
+    withdrawn = (
+        WithdrawalItem.objects
+        .filter(product=OuterRef("pk"))
+        .order_by()
+        .values("product")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    returned = (
+        ReturnItem.objects
+        .filter(withdrawal_item__product=OuterRef("pk"))
+        .order_by()
+        .values("withdrawal_item__product")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    return (
+        products
         .annotate(
-            withdrawn_sum=Coalesce(Sum("withdrawalitem__quantity"), 0),
-            returned_sum=Coalesce(Sum("withdrawalitem__returnitem__quantity"), 0),
+            withdrawn_sum=Coalesce(Subquery(withdrawn), 0),
+            returned_sum=Coalesce(Subquery(returned), 0),
         )
         .annotate(outstanding=F("withdrawn_sum") - F("returned_sum"))
         .annotate(
@@ -50,9 +82,18 @@ def depot_detail(request, depot_id):
                 output_field=IntegerField(),
             )
         )
-        .order_by("name")
     )
 
+
+@staff_required
+def depot_detail(request, depot_id):
+    depot = get_object_or_404(Depot, id=depot_id)
+    search = request.GET.get("q", "")
+
+    products = _with_stock_totals(
+        Product.objects.filter(depot=depot).only("id", "name", "quantity", "unit", "item_type")
+    ).order_by("name")
+
     if search:
         products = products.filter(name__icontains=search)
 
@@ -69,36 +110,14 @@ def all_products(request):
     search = request.GET.get("q", "")
     sort = request.GET.get("sort", "name")
 
-    valid_sorts = {
-        "name": "name",
-        "name_desc": "-name",
-        "qty": "quantity",
-        "qty_desc": "-quantity",
-        "depot": "depot__name",
-        "depot_desc": "-depot__name",
-    }
-    order_by = valid_sorts.get(sort, "name")
+    order_by = PRODUCT_SORTS.get(sort, "name")
 
-    products = (
+    products = _with_stock_totals(
         Product.objects
         .select_related("depot")
         .filter(depot__is_active=True)
-        .annotate(
-            withdrawn_sum=Coalesce(Sum("withdrawalitem__quantity"), 0),
-            returned_sum=Coalesce(Sum("withdrawalitem__returnitem__quantity"), 0),
-        )
-        .annotate(
-            outstanding=F("withdrawn_sum") - F("returned_sum"),
-        )
-        .annotate(
-            total_quantity=Case(
-                When(item_type="returnable", then=F("quantity") + F("outstanding")),
-                default=F("quantity"),
-                output_field=IntegerField(),
-            )
-        )
-        .order_by(order_by)
-    )
+        .only("id", "name", "quantity", "unit", "item_type", "depot__name")
+    ).order_by(order_by)
 
     if search:
         products = products.filter(
@@ -106,8 +125,10 @@ def all_products(request):
             Q(description__icontains=search)
         )
 
+    page_obj = Paginator(products, PRODUCTS_PER_PAGE).get_page(request.GET.get("page"))
     return render(request, "inventory/all_products.html", {
-        "products": products,
+        "products": page_obj,
+        "page_obj": page_obj,
         "search": search,
         "sort": sort,
     })
@@ -116,28 +137,23 @@ def all_products(request):
 
 @staff_required
 def product_detail(request, product_id):
-    product = get_object_or_404(Product, id=product_id)
+    product = get_object_or_404(Product.objects.select_related("depot"), id=product_id)
 
-    withdrawn_items = (
+    # Only rows still out come back, already flattened to what the list shows
+    items_display = list(
         WithdrawalItem.objects
         .filter(product=product)
-        .select_related("header", "header__employee")
         .annotate(returned_sum=Coalesce(Sum("returnitem__quantity"), 0))
         .annotate(outstanding=F("quantity") - F("returned_sum"))
+        .filter(outstanding__gt=0)
+        .values(
+            employee=F("header__employee__name"),
+            qty=F("outstanding"),
+            date=F("header__date"),
+            notes=F("header__notes"),
+        )
     )
-
-    items_display = []
-    total_taken = 0
-
-    for w in withdrawn_items:
-        if w.outstanding > 0:
-            items_display.append({
-                "employee": w.header.employee.name,
-                "qty": w.outstanding,
-                "date": w.header.date,
-                "notes": w.header.notes,
-            })
-            total_taken += w.outstanding
+    total_taken = sum(item["qty"] for item in items_display)
 
     total_stock = product.quantity + total_taken
 
@@ -153,17 +169,40 @@ def product_detail(request, product_id):
 # CREATE / UPDATE FORMS (POST) => NEVER CACHE
 # ==========================
 
+def _shift_stock(product_id, delta):
+    """
+    Add delta (negative to take) to a product's stock in one UPDATE, without
+    a read-modify-write.
+    """
+    Product.objects.filter(pk=product_id).update(quantity=F("quantity") + delta)
+
+
+def _save_product(form):
+    """
+    Save a validated ProductForm. The case-insensitive unique index is the
+    final word on duplicate names: a concurrent insert that slipped past
+    form validation becomes a form error instead of a 500.
+    """
+    try:
+        with transaction.atomic():
+            form.save()
+    except IntegrityError:
+        form.add_error("name", PRODUCT_NAME_TAKEN)
+        return False
+    return True
+
+
 @staff_required
 @never_cache
 def add_product(request):
     form = ProductForm(request.POST or None)
 
-    if request.method == "POST" and form.is_valid():
-        product = form.save()
+    if request.method == "POST" and form.is_valid() and _save_product(form):
+        product = form.instance
 
         log_action(
             user=request.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="Product",
             object_id=str(product.id),
             description=f"Added product {product.name} to depot {product.depot.name}",
@@ -182,12 +221,12 @@ def add_quantity(request, product_id):
 
     if request.method == "POST" and form.is_valid():
         qty = form.cleaned_data["quantity"]
-        product.quantity += qty
-        product.save()
+        _shift_stock(product.id, qty)
+        product.refresh_from_db(fields=["quantity"])
 
         log_action(
             user=request.user,
-            action="ADD",
+            action=AuditLog.Action.ADD,
             model="Product",
             object_id=str(product.id),
             description=f"Added {qty} units to product '{product.name}' (new stock: {product.quantity})",
@@ -208,12 +247,10 @@ def edit_product(request, product_id):
     product = get_object_or_404(Product, id=product_id)
     form = ProductForm(request.POST or None, instance=product)
 
-    if request.method == "POST" and form.is_valid():
-        form.save()
-
+    if request.method == "POST" and form.is_valid() and _save_product(form):
         log_action(
             user=request.user,
-            action="UPDATE",
+            action=AuditLog.Action.UPDATE,
             model="Product",
             object_id=str(product.id),
             description=f"Edited product {product.name}",
@@ -237,7 +274,7 @@ def delete_product(request, product_id):
     if request.method == "POST":
         log_action(
             user=request.user,
-            action="DELETE",
+            action=AuditLog.Action.DELETE,
             model="Product",
             object_id=str(product.id),
             description=f"Deleted product {product.name}",
@@ -262,12 +299,13 @@ def employees_view(request, employee_id=None):
 
     if employee_id:
         selected_employee = get_object_or_404(Employee, id=employee_id)
-        withdrawals = WithdrawalItem.objects.filter(
-            header__employee=selected_employee,
-            product__item_type="returnable"
-        ).select_related("product")
-
-        withdrawals = [w for w in withdrawals if w.outstanding_qty > 0]
+        withdrawals = (
+            WithdrawalItem.objects
+            .filter(header__employee=selected_employee, product__item_type="returnable")
+            .select_related("product", "header")
+            .annotate(returned_sum=Coalesce(Sum("returnitem__quantity"), 0))
+            .filter(quantity__gt=F("returned_sum"))
+        )
 
     context = {
         "employees": employees,
@@ -280,7 +318,8 @@ def employees_view(request, employee_id=None):
 
 @login_required
 def my_returnables(request):
-    employee = Employee.objects.filter(user=request.user).first()
+    # Reverse one-to-one: a unique-index lookup, cached on request.user
+    employee = getattr(request.user, "employee", None)
     if not employee:
         return redirect("core:home")
 
@@ -309,47 +348,55 @@ def create_withdrawal(request):
         extra=1
     )
 
-    products = Product.objects.select_related("depot").filter(depot__is_active=True).order_by("name")
+    products = active_products()
 
     if request.method == "POST":
         header_form = WithdrawalHeaderForm(request.POST)
         formset = ItemFormSet(request.POST)
 
         if header_form.is_valid() and formset.is_valid():
+            items = [
+                form.save(commit=False) for form in formset
+                if form.cleaned_data.get("product") and form.cleaned_data.get("quantity")
+            ]
+            # A product may appear on several rows; stock is checked per product
+            wanted = defaultdict(int)
+            for item in items:
+                wanted[item.product_id] += item.quantity
+
             with transaction.atomic():
-                header = header_form.save()
+                # Lock every product on the slip in one query to prevent race conditions
+                locked = Product.objects.select_for_update().in_bulk(wanted)
+
+                for item in items:
+                    product = locked[item.product_id]
+                    if product.quantity < wanted[product.id]:
+                        return render(request, "inventory/withdrawal_form.html", {
+                            "header_form": header_form,
+                            "formset": formset,
+                            "products": products,
+                            "error": f"Not enough stock for {product.name}. Available: {product.quantity}",
+                        })
 
-                for form in formset:
-                    if form.cleaned_data.get("product") and form.cleaned_data.get("quantity"):
-                        item = form.save(commit=False)
-                        item.header = header
-                        qty = item.quantity
-
-                        # Lock the product row to prevent race conditions
-                        product = Product.objects.select_for_update().get(id=item.product_id)
-
-                        if product.quantity < qty:
-                            transaction.set_rollback(True)
-                            return render(request, "inventory/withdrawal_form.html", {
-                                "header_form": header_form,
-                                "formset": formset,
-                                "products": products,
-                                "error": f"Not enough stock for {product.name}. Available: {product.quantity}",
-                            })
-
-                        item.product = product
-                        item.save()
-                        product.quantity -= qty
-                        product.save()
-
-                        log_action(
-                            user=request.user,
-                            action="WITHDRAW",
-                            model="Product",
-                            object_id=str(product.id),
-                            description=f"Withdrawn {qty} of {product.name} by {header.employee.name}",
-                            ip_address=get_client_ip(request),
-                        )
+                header = header_form.save()
+                for item in items:
+                    item.header = header
+                WithdrawalItem.objects.bulk_create(items)
+
+                for product_id, qty in wanted.items():
+                    _shift_stock(product_id, -qty)
+
+                ip_address = get_client_ip(request)
+                for item in items:
+                    product = locked[item.product_id]
+                    log_action(
+                        user=request.user,
+                        action=AuditLog.Action.WITHDRAW,
+                        model="Product",
+                        object_id=str(product.id),
+                        description=f"Withdrawn {item.quantity} of {product.name} by {header.employee.name}",
+                        ip_address=ip_address,
+                    )
 
                 return redirect("inventory:inventory-home")
 
@@ -369,7 +416,12 @@ def create_withdrawal(request):
 @staff_required
 @never_cache
 def return_item(request, withdrawal_item_id):
-    withdrawal_item = get_object_or_404(WithdrawalItem, id=withdrawal_item_id)
+    withdrawal_item = get_object_or_404(
+        WithdrawalItem.objects
+        .select_related("header__employee", "product")
+        .annotate(returned_sum=Coalesce(Sum("returnitem__quantity"), 0)),
+        id=withdrawal_item_id,
+    )
     employee = withdrawal_item.header.employee
     product = withdrawal_item.product
 
@@ -390,9 +442,6 @@ def return_item(request, withdrawal_item_id):
             })
 
         with transaction.atomic():
-            # Lock the product row to prevent race conditions
-            product = Product.objects.select_for_update().get(id=product.id)
-
             # Create a return header
             return_header = ReturnHeader.objects.create(employee=employee)
 
@@ -404,12 +453,11 @@ def return_item(request, withdrawal_item_id):
             )
 
             # Put back into stock
-            product.quantity += qty
-            product.save()
+            _shift_stock(product.id, qty)
 
             log_action(
                 user=request.user,
-                action="RETURN",
+                action=AuditLog.Action.RETURN,
                 model="Product",
                 object_id=str(product.id),
                 description=f"Returned {qty} of {product.name} by {employee.name}",
@@ -428,7 +476,9 @@ def return_item(request, withdrawal_item_id):
 
 @staff_required
 def withdraw_detail(request, id):
-    item = get_object_or_404(WithdrawalItem, id=id)
+    item = get_object_or_404(
+        WithdrawalItem.objects.select_related("header__employee", "product"), id=id
+    )
     header = item.header
 
     return render(request, "inventory/withdraw_detail.html", {
@@ -11,6 +11,18 @@ from inventory.models import Depot
 
 User = get_user_model()
 
+USERNAME_TAKEN = "Ky username ekziston."
+
+
+# Shared by the create and edit forms (ModelFormMetaclass builds the fields
+# from these once per form class, not per request)
+EMPLOYEE_FIELDS = ["name", "position", "phone", "have_budget", "is_active"]
+EMPLOYEE_WIDGETS = {
+    "name": forms.TextInput(attrs={"autocomplete": "off"}),
+    "position": forms.TextInput(attrs={"autocomplete": "off"}),
+    "phone": forms.TextInput(attrs={"autocomplete": "off"}),
+}
+
 
 class EmployeeCreateForm(forms.ModelForm):
     username = forms.CharField(max_length=150)
@@ -20,18 +32,12 @@ class EmployeeCreateForm(forms.ModelForm):
 
     class Meta:
         model = Employee
-        fields = ["name", "position", "phone", "have_budget", "is_active"]
-        widgets = {
-            "name": forms.TextInput(attrs={"autocomplete": "off"}),
-            "position": forms.TextInput(attrs={"autocomplete": "off"}),
-            "phone": forms.TextInput(attrs={"autocomplete": "off"}),
-        }
+        fields = EMPLOYEE_FIELDS
+        widgets = EMPLOYEE_WIDGETS
 
     def clean_username(self):
-        username = self.cleaned_data["username"].strip()
-        if User.objects.filter(username=username).exists():
-            raise forms.ValidationError("Ky username ekziston.")
-        return username
+        # Uniqueness is left to auth_user's unique index (see employee_create)
+        return self.cleaned_data["username"].strip()
 
     def clean_password1(self):
         password = self.cleaned_data.get("password1")
@@ -52,12 +58,8 @@ class EmployeeCreateForm(forms.ModelForm):
 class EmployeeEditForm(forms.ModelForm):
     class Meta:
         model = Employee
-        fields = ["name", "position", "phone", "have_budget", "is_active"]
-        widgets = {
-            "name": forms.TextInput(attrs={"autocomplete": "off"}),
-            "position": forms.TextInput(attrs={"autocomplete": "off"}),
-            "phone": forms.TextInput(attrs={"autocomplete": "off"}),
-        }
+        fields = EMPLOYEE_FIELDS
+        widgets = EMPLOYEE_WIDGETS
 
 
 
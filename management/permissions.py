@@ -3,12 +3,20 @@ from functools import wraps
 from django.contrib.auth.views import redirect_to_login
 from django.core.exceptions import PermissionDenied
 
+from accounts.decorators import cache_for_request
+from core.utils import get_group_names
+
 STAFF_GROUP = "staff"
 EMPLOYEE_GROUP = "employee"
 
 
-def _in_group(user, name):
-    return user.groups.filter(name=name).exists()
+@cache_for_request
+def _is_admin(request):
+    return request.user.is_authenticated and request.user.is_superuser
+
+
+def _in_group(request, name):
+    return name in get_group_names(request.user)
 
 
 def _deny_or_login(request):
@@ -23,7 +31,7 @@ def admin_required(view_func):
     """
     @wraps(view_func)
     def _wrapped(request, *args, **kwargs):
-        if request.user.is_authenticated and request.user.is_superuser:
+        if _is_admin(request):
             return view_func(request, *args, **kwargs)
         return _deny_or_login(request)
     return _wrapped
@@ -38,7 +46,7 @@ def staff_required(view_func):
         user = request.user
         if (
             user.is_authenticated and
-            (user.is_superuser or _in_group(user, STAFF_GROUP))
+            (user.is_superuser or _in_group(request, STAFF_GROUP))
         ):
             return view_func(request, *args, **kwargs)
         return _deny_or_login(request)
@@ -56,8 +64,8 @@ def employee_required(view_func):
         if (
             user.is_authenticated and (
                 user.is_superuser or
-                _in_group(user, STAFF_GROUP) or
-                _in_group(user, EMPLOYEE_GROUP)
+                _in_group(request, STAFF_GROUP) or
+                _in_group(request, EMPLOYEE_GROUP)
             )
         ):
             return view_func(request, *args, **kwargs)
@@ -1,3 +1,125 @@
-from django.test import TestCase
+"""
+Tests for the Management app - Admin CRUD views.
+"""
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.db import connection
+from django.urls import reverse
+from audit.models import AuditLog
+from core.models import Employee, Vehicle
+from fuel.models import FuelTank
+from management.forms import USERNAME_TAKEN
+from management.permissions import EMPLOYEE_GROUP, STAFF_GROUP
 
-# Create your tests here.
+
+def _updates(queries, table):
+    """UPDATE statements on table among captured queries."""
+    return [q["sql"] for q in queries if q["sql"].startswith(f'UPDATE "{table}"')]
+
+
+class EmployeeCreateViewTest(TestCase):
+    """Tests for creating an employee together with its login."""
+
+    def setUp(self):
+        self.client = Client()
+        User.objects.create_superuser(
+            username="admin",
+            password="testpass123"
+        )
+        self.client.login(username="admin", password="testpass123")
+        self.url = reverse("management:employee-create")
+        self.data = {
+            "username": "worker",
+            "password1": "Str0ng!pass99",
+            "password2": "Str0ng!pass99",
+            "name": "New Worker",
+            "position": "Driver",
+            "is_active": "on",
+        }
+
+    def test_taken_username_shows_form_error(self):
+        """Test a taken username is reported on the field and nothing is created."""
+        User.objects.create_user(username="worker", password="testpass123")
+        users_before = User.objects.count()
+
+        response = self.client.post(self.url, self.data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["form"].errors["username"], [USERNAME_TAKEN])
+        self.assertEqual(User.objects.count(), users_before)
+        self.assertFalse(Employee.objects.filter(name="New Worker").exists())
+
+    def test_create_employee_links_employee_group(self):
+        """Test a plain employee gets only the employee group and no staff flag."""
+        response = self.client.post(self.url, self.data)
+
+        self.assertRedirects(response, reverse("management:employee-list"), fetch_redirect_response=False)
+        user = User.objects.get(username="worker")
+        self.assertFalse(user.is_staff)
+        self.assertEqual(set(user.groups.values_list("name", flat=True)), {EMPLOYEE_GROUP})
+        self.assertEqual(user.employee.name, "New Worker")
+
+    def test_make_staff_sets_staff_flag_and_groups(self):
+        """Test make_staff sets is_staff and links both the employee and staff groups."""
+        self.client.post(self.url, {**self.data, "make_staff": "on"})
+
+        user = User.objects.get(username="worker")
+        self.assertTrue(user.is_staff)
+        self.assertEqual(
+            set(user.groups.values_list("name", flat=True)), {EMPLOYEE_GROUP, STAFF_GROUP}
+        )
+
+
+class EditViewsWriteChangesOnlyTest(TestCase):
+    """Tests for the edit views writing only the columns that changed."""
+
+    def setUp(self):
+        self.client = Client()
+        User.objects.create_superuser(
+            username="admin",
+            password="testpass123"
+        )
+        self.client.login(username="admin", password="testpass123")
+
+    def test_unchanged_vehicle_edit_skips_update_and_audit(self):
+        """Test resubmitting a vehicle unchanged runs no UPDATE and logs nothing."""
+        vehicle = Vehicle.objects.create(plate="AA111BB", chassis="CH-1")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    reverse("management:vehicle-edit", args=[vehicle.pk]),
+                    {"plate": "AA111BB", "chassis": "CH-1", "is_active": "on"},
+                )
+
+        self.assertRedirects(
+            response, reverse("management:vehicle-detail", args=[vehicle.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(_updates(queries.captured_queries, Vehicle._meta.db_table), [])
+        self.assertFalse(AuditLog.objects.filter(model="Vehicle").exists())
+
+    def test_tank_rename_writes_only_name(self):
+        """Test renaming a tank updates only name and keeps its current level."""
+        tank = FuelTank.objects.create(name="Tank 1", capacity=5000)
+        FuelTank.objects.filter(pk=tank.pk).update(current_level=1200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(
+                    reverse("management:tank-edit", args=[tank.pk]),
+                    {"name": "Tank A", "capacity": 5000},
+                )
+
+        updates = _updates(queries.captured_queries, FuelTank._meta.db_table)
+        self.assertEqual(len(updates), 1)
+        set_clause = updates[0].split(" WHERE ")[0]
+        self.assertIn('"name"', set_clause)
+        self.assertNotIn('"capacity"', set_clause)
+        self.assertNotIn('"current_level"', set_clause)
+
+        tank.refresh_from_db()
+        self.assertEqual(tank.name, "Tank A")
+        self.assertEqual(tank.current_level, 1200)
+        self.assertTrue(AuditLog.objects.filter(model="FuelTank", object_id=str(tank.pk)).exists())
@@ -1,18 +1,38 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.db import transaction
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
 from django.views.decorators.cache import never_cache
 
 from core.models import Employee, Vehicle
 from fuel.models import FuelTank
 from inventory.models import Depot
 
-from .forms import EmployeeCreateForm, EmployeeEditForm, VehicleForm, FuelTankForm, DepotForm
-from .permissions import admin_required
+from .forms import USERNAME_TAKEN, EmployeeCreateForm, EmployeeEditForm, VehicleForm, FuelTankForm, DepotForm
+from .permissions import EMPLOYEE_GROUP, STAFF_GROUP, admin_required
 
-from audit.utils import log_action
-from audit.middleware import get_client_ip
+from audit.models import AuditLog
+from audit.utils import get_client_ip, log_action
+
+
+LIST_PER_PAGE = 50
+
+
+def _page(request, queryset):
+    """The ?page= slice of a management list (templates/includes/pagination.html)."""
+    return Paginator(queryset, LIST_PER_PAGE).get_page(request.GET.get("page"))
+
+
+def _save_changed(form):
+    """
+    Save a valid edit form, UPDATE-ing only the columns the user changed.
+    Returns False without touching the DB when nothing changed.
+    """
+    if not form.has_changed():
+        return False
+    form.save(commit=False).save(update_fields=form.changed_data)
+    return True
 
 
 @admin_required
@@ -26,52 +46,64 @@ def dashboard(request):
 
 @admin_required
 def employee_list(request):
-    employees = Employee.objects.order_by("-is_active", "name")
-    return render(request, "management/employees/list.html", {"employees": employees})
+    employees = Employee.objects.only("id", "name", "position", "is_active").order_by("-is_active", "name")
+    page_obj = _page(request, employees)
+    return render(request, "management/employees/list.html", {"employees": page_obj, "page_obj": page_obj})
 
 
 User = get_user_model()
 
 
+def _groups_named(names):
+    """Groups by name in one query, recreating any deleted since accounts' post_migrate."""
+    groups = list(Group.objects.filter(name__in=names))
+    found = {group.name for group in groups}
+    groups += [Group.objects.create(name=name) for name in names if name not in found]
+    return groups
+
+
 @admin_required
 @never_cache
 def employee_create(request):
     if request.method == "POST":
         form = EmployeeCreateForm(request.POST)
         if form.is_valid():
+            make_staff = form.cleaned_data.get("make_staff", False)
             with transaction.atomic():
-                # 1) Create user
-                user = User.objects.create_user(
-                    username=form.cleaned_data["username"],
-                    password=form.cleaned_data["password1"],
-                )
-
-                # 2) Assign groups
-                employee_group, _ = Group.objects.get_or_create(name="employee")
-                user.groups.add(employee_group)
-
-                if form.cleaned_data.get("make_staff", False):
-                    staff_group, _ = Group.objects.get_or_create(name="staff")
-                    user.groups.add(staff_group)
-                    user.is_staff = True  # optional but recommended
-
-                user.save()
-
-                # 3) Create employee linked to that user
-                employee = form.save(commit=False)
-                employee.user = user
-                employee.save()
-
-                log_action(
-                    user=request.user,
-                    action="CREATE",
-                    model="Employee",
-                    object_id=str(employee.id),
-                    description=f"Employee created and linked to user {user.username}",
-                    ip_address=get_client_ip(request),
-                )
-
-            return redirect("management:employee-list")
+                # 1) Create user (is_staff set up front: no second UPDATE).
+                # Taken username: the unique index is the check, no pre-SELECT;
+                # the savepoint keeps the outer transaction usable
+                try:
+                    with transaction.atomic():
+                        user = User.objects.create_user(
+                            username=form.cleaned_data["username"],
+                            password=form.cleaned_data["password1"],
+                            is_staff=make_staff,
+                        )
+                except IntegrityError:
+                    user = None
+                    form.add_error("username", USERNAME_TAKEN)
+
+                if user is not None:
+                    # 2) Assign groups in one add()
+                    group_names = [EMPLOYEE_GROUP, STAFF_GROUP] if make_staff else [EMPLOYEE_GROUP]
+                    user.groups.add(*_groups_named(group_names))
+
+                    # 3) Create employee linked to that user
+                    employee = form.save(commit=False)
+                    employee.user = user
+                    employee.save()
+
+                    log_action(
+                        user=request.user,
+                        action=AuditLog.Action.CREATE,
+                        model="Employee",
+                        object_id=str(employee.id),
+                        description=f"Employee created and linked to user {user.username}",
+                        ip_address=get_client_ip(request),
+                    )
+            if user is not None:
+                return redirect("management:employee-list")
     else:
         form = EmployeeCreateForm()
 
@@ -80,7 +112,7 @@ def employee_create(request):
 
 @admin_required
 def employee_detail(request, pk):
-    employee = get_object_or_404(Employee, pk=pk)
+    employee = get_object_or_404(Employee.objects.select_related("user"), pk=pk)
     return render(request, "management/employees/detail.html", {"employee": employee})
 
 
@@ -91,16 +123,16 @@ def employee_edit(request, pk):
     form = EmployeeEditForm(request.POST or None, instance=employee)
 
     if request.method == "POST" and form.is_valid():
-        emp = form.save()
-        log_action(
-            user=request.user,
-            action="UPDATE",
-            model="Employee",
-            object_id=str(emp.pk),
-            description=f"Updated employee: {emp.name}",
-            ip_address=get_client_ip(request),
-        )
-        return redirect("management:employee-detail", pk=emp.pk)
+        if _save_changed(form):
+            log_action(
+                user=request.user,
+                action=AuditLog.Action.UPDATE,
+                model="Employee",
+                object_id=str(employee.pk),
+                description=f"Updated employee: {employee.name}",
+                ip_address=get_client_ip(request),
+            )
+        return redirect("management:employee-detail", pk=employee.pk)
 
     return render(request, "management/employees/form.html", {"form": form, "employee": employee})
 
@@ -108,7 +140,7 @@ def employee_edit(request, pk):
 @admin_required
 @never_cache
 def employee_delete(request, pk):
-    employee = get_object_or_404(Employee, pk=pk)
+    employee = get_object_or_404(Employee.objects.select_related("user"), pk=pk)
 
     if request.method == "POST":
         name = employee.name
@@ -124,7 +156,7 @@ def employee_delete(request, pk):
 
         log_action(
             user=request.user,
-            action="DELETE",
+            action=AuditLog.Action.DELETE,
             model="Employee",
             object_id=str(emp_pk),
             description=f"Deleted employee: {name} ({pos})" + (f" and user: {linked_user.username}" if linked_user else ""),
@@ -143,7 +175,8 @@ def employee_delete(request, pk):
 @admin_required
 def vehicle_list(request):
     vehicles = Vehicle.objects.order_by("-is_active", "plate")
-    return render(request, "management/vehicles/list.html", {"vehicles": vehicles})
+    page_obj = _page(request, vehicles)
+    return render(request, "management/vehicles/list.html", {"vehicles": page_obj, "page_obj": page_obj})
 
 
 @admin_required
@@ -156,7 +189,7 @@ def vehicle_create(request):
 
         log_action(
             user=request.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="Vehicle",
             object_id=str(v.pk),
             description=f"Created vehicle: {v.plate}",
@@ -181,18 +214,17 @@ def vehicle_edit(request, pk):
     form = VehicleForm(request.POST or None, instance=vehicle)
 
     if request.method == "POST" and form.is_valid():
-        v = form.save()
-
-        log_action(
-            user=request.user,
-            action="UPDATE",
-            model="Vehicle",
-            object_id=str(v.pk),
-            description=f"Updated vehicle: {v.plate}",
-            ip_address=get_client_ip(request),
-        )
-
-        return redirect("management:vehicle-detail", pk=v.pk)
+        if _save_changed(form):
+            log_action(
+                user=request.user,
+                action=AuditLog.Action.UPDATE,
+                model="Vehicle",
+                object_id=str(vehicle.pk),
+                description=f"Updated vehicle: {vehicle.plate}",
+                ip_address=get_client_ip(request),
+            )
+
+        return redirect("management:vehicle-detail", pk=vehicle.pk)
 
     return render(request, "management/vehicles/form.html", {"form": form, "vehicle": vehicle})
 
@@ -209,7 +241,7 @@ def vehicle_delete(request, pk):
 
         log_action(
             user=request.user,
-            action="DELETE",
+            action=AuditLog.Action.DELETE,
             model="Vehicle",
             object_id=str(v_pk),
             description=f"Deleted vehicle: {plate}",
@@ -228,7 +260,8 @@ def vehicle_delete(request, pk):
 @admin_required
 def tank_list(request):
     tanks = FuelTank.objects.order_by("name")
-    return render(request, "management/tanks/list.html", {"tanks": tanks})
+    page_obj = _page(request, tanks)
+    return render(request, "management/tanks/list.html", {"tanks": page_obj, "page_obj": page_obj})
 
 
 @admin_required
@@ -241,7 +274,7 @@ def tank_create(request):
 
         log_action(
             user=request.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="FuelTank",
             object_id=str(tank.pk),
             description=f"Created fuel tank: {tank.name} (Capacity: {tank.capacity}L)",
@@ -267,16 +300,15 @@ def tank_edit(request, pk):
     form = FuelTankForm(request.POST or None, instance=tank)
 
     if request.method == "POST" and form.is_valid():
-        tank = form.save()
-
-        log_action(
-            user=request.user,
-            action="UPDATE",
-            model="FuelTank",
-            object_id=str(tank.pk),
-            description=f"Updated fuel tank: {old_name} → {tank.name} (Capacity: {tank.capacity}L)",
-            ip_address=get_client_ip(request),
-        )
+        if _save_changed(form):
+            log_action(
+                user=request.user,
+                action=AuditLog.Action.UPDATE,
+                model="FuelTank",
+                object_id=str(tank.pk),
+                description=f"Updated fuel tank: {old_name} → {tank.name} (Capacity: {tank.capacity}L)",
+                ip_address=get_client_ip(request),
+            )
 
         return redirect("management:tank-detail", pk=tank.pk)
 
@@ -295,7 +327,7 @@ def tank_delete(request, pk):
 
         log_action(
             user=request.user,
-            action="DELETE",
+            action=AuditLog.Action.DELETE,
             model="FuelTank",
             object_id=str(t_pk),
             description=f"Deleted fuel tank: {name}",
@@ -314,7 +346,8 @@ def tank_delete(request, pk):
 @admin_required
 def depot_list(request):
     depots = Depot.objects.order_by("name")
-    return render(request, "management/depots/list.html", {"depots": depots})
+    page_obj = _page(request, depots)
+    return render(request, "management/depots/list.html", {"depots": page_obj, "page_obj": page_obj})
 
 
 @admin_required
@@ -327,7 +360,7 @@ def depot_create(request):
 
         log_action(
             user=request.user,
-            action="CREATE",
+            action=AuditLog.Action.CREATE,
             model="Depot",
             object_id=str(depot.pk),
             description=f"Created depot: {depot.name}",
@@ -353,16 +386,15 @@ def depot_edit(request, pk):
     form = DepotForm(request.POST or None, instance=depot)
 
     if request.method == "POST" and form.is_valid():
-        depot = form.save()
-
-        log_action(
-            user=request.user,
-            action="UPDATE",
-            model="Depot",
-            object_id=str(depot.pk),
-            description=f"Updated depot: {old_name} → {depot.name}",
-            ip_address=get_client_ip(request),
-        )
+        if _save_changed(form):
+            log_action(
+                user=request.user,
+                action=AuditLog.Action.UPDATE,
+                model="Depot",
+                object_id=str(depot.pk),
+                description=f"Updated depot: {old_name} → {depot.name}",
+                ip_address=get_client_ip(request),
+            )
 
         return redirect("management:depot-detail", pk=depot.pk)
 
@@ -381,7 +413,7 @@ def depot_delete(request, pk):
 
         log_action(
             user=request.user,
-            action="DELETE",
+            action=AuditLog.Action.DELETE,
             model="Depot",
             object_id=str(d_pk),
             description=f"Deleted depot: {name}",